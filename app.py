@@ -1,74 +1,422 @@
 import logging
-from flask import Flask, request, jsonify
-from scuapi import API
+import random
+import contextvars
+import gzip
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from flask import Flask, request, jsonify, g
+from scuapi import API, RetryPolicy, Series, TTLCache, make_session
+from scuapi.scuapi import NoSeasonFoundError, WebPageStatusCodeError
+from scuapi.metrics import Registry
+from scuapi.store import CatalogIndex, ResolutionIndex, TranslationCache, NO_MATCH
+from scuapi.singleflight import SingleFlight
+from scuapi.refresh import RefreshBudget, RefreshScheduler
 import requests
 import re
 import unicodedata
 from urllib.parse import urlparse, parse_qs
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 from deep_translator import GoogleTranslator
 import os
-
-# Configurazione del logger
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s %(levelname)s %(message)s')
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # dipendenza opzionale: senza brotli si usa solo gzip
+    brotli = None
+
+# Configurazione del logger: livello, campionamento dei log di debug per richiesta e dimensione massima dei payload
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))
+LOG_MAX_PAYLOAD = int(os.getenv('LOG_MAX_PAYLOAD', 300))
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(message)s')
+DEBUG_ENABLED = logging.getLogger().isEnabledFor(logging.DEBUG)
+
+# Filtro che scarta i log di debug delle richieste non campionate
+log_sampled = contextvars.ContextVar('log_sampled', default=True)
+
+class DebugSampler(logging.Filter):
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or log_sampled.get()
+
+for handler in logging.getLogger().handlers:
+    handler.addFilter(DebugSampler())
+
+# Riassunto di un payload per i log, calcolato solo se il messaggio viene effettivamente emesso
+class Summary:
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        payload = self.payload
+        if isinstance(payload, dict):
+            text = '{' + ', '.join(
+                f"{key}: <{len(value)} elementi>" if isinstance(value, (list, dict)) else f"{key}: {value!r}"
+                for key, value in payload.items()
+            ) + '}'
+        elif isinstance(payload, (list, tuple)):
+            text = f"<{len(payload)} elementi>"
+        else:
+            text = repr(payload)
+        return text if len(text) <= LOG_MAX_PAYLOAD else text[:LOG_MAX_PAYLOAD] + '...'
 
 app = Flask(__name__)
 
+@app.before_request
+def sample_debug_logs():
+    if DEBUG_ENABLED:
+        log_sampled.set(LOG_DEBUG_SAMPLE_RATE >= 1.0 or random.random() < LOG_DEBUG_SAMPLE_RATE)
+
+# Propaga ai thread di lavoro la decisione di campionamento della richiesta corrente
+def with_log_context(fn):
+    sampled = log_sampled.get()
+
+    def run(*args, **kwargs):
+        log_sampled.set(sampled)
+        return fn(*args, **kwargs)
+    return run
+
+# Metriche esposte su /metrics: richieste per route, latenza ed errori per ogni chiamata esterna, cache
+metrics = Registry()
+http_requests = metrics.counter('http_requests_total', 'Richieste HTTP per route e codice di stato', ['route', 'status'])
+http_latency = metrics.histogram('http_request_duration_seconds', 'Durata delle richieste HTTP per route', ['route'])
+upstream_latency = metrics.histogram('upstream_request_duration_seconds', 'Durata delle chiamate esterne per tipo', ['upstream'])
+upstream_errors = metrics.counter('upstream_errors_total', 'Errori delle chiamate esterne per tipo ed eccezione', ['upstream', 'error'])
+
+# Cache registrate per le metriche di hit ratio
+CACHES = {}
+
+def cache_stat(field):
+    return lambda: {(name,): cache.stats()[field] for name, cache in CACHES.items() if cache is not None}
+
+metrics.gauge('cache_hits', 'Letture andate a buon fine per cache', ['cache'], cache_stat('hits'))
+metrics.gauge('cache_misses', 'Letture senza risultato per cache', ['cache'], cache_stat('misses'))
+metrics.gauge('cache_hit_ratio', 'Rapporto tra hit e letture per cache', ['cache'], cache_stat('hit_ratio'))
+metrics.gauge('cache_size', 'Numero di voci per cache', ['cache'], cache_stat('size'))
+
+def record_upstream(kind, seconds, error):
+    upstream_latency.observe(seconds, kind)
+    if error is not None:
+        upstream_errors.inc(kind, type(error).__name__)
+
+# Misura una chiamata esterna effettuata direttamente dall'app (TMDb, traduttore)
+@contextmanager
+def upstream_timer(kind):
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        record_upstream(kind, time.perf_counter() - start, error)
+
+# Richieste dei client in corso, usate per sospendere il lavoro in background sotto carico
+foreground_in_flight = 0
+foreground_lock = threading.Lock()
+
+@app.before_request
+def start_request_timer():
+    global foreground_in_flight
+    g.request_start = time.perf_counter()
+    with foreground_lock:
+        foreground_in_flight += 1
+
+@app.teardown_request
+def end_foreground_request(exc):
+    global foreground_in_flight
+    with foreground_lock:
+        foreground_in_flight -= 1
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    if 'request_start' in g:
+        http_latency.observe(time.perf_counter() - g.request_start, route)
+    http_requests.inc(route, str(response.status_code))
+    return response
+
+# Validatori, cache HTTP e compressione delle risposte: i dati delle serie possono essere messi in cache
+# da client e CDN per CACHE_MAX_AGE secondi, le altre risposte vanno sempre rivalidate con l'ETag
+CACHE_MAX_AGE = int(os.getenv('CACHE_MAX_AGE', 300))
+CACHE_STALE_WHILE_REVALIDATE = int(os.getenv('CACHE_STALE_WHILE_REVALIDATE', 3600))
+CACHEABLE_ROUTES = {'/load', '/get_seasons'}
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', 5))
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html'}
+
+def encode_body(body):
+    # Brotli se disponibile e accettato dal client, altrimenti gzip
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br', brotli.compress(body, quality=BROTLI_QUALITY)
+    if request.accept_encodings['gzip']:
+        return 'gzip', gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return None, body
+
+@app.after_request
+def add_http_caching(response):
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200 or response.direct_passthrough:
+        return response
+
+    route = request.url_rule.rule if request.url_rule else None
+    if route in CACHEABLE_ROUTES:
+        response.headers['Cache-Control'] = f"public, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_STALE_WHILE_REVALIDATE}"
+    elif route != '/metrics':
+        response.headers['Cache-Control'] = 'no-cache'
+    compressible = response.mimetype in COMPRESSIBLE_MIMETYPES
+    if compressible:
+        response.vary.add('Accept-Encoding')
+
+    # ETag debole: identifica il contenuto indipendentemente dalla codifica usata per inviarlo
+    body = response.get_data()
+    response.set_etag(hashlib.sha1(body).hexdigest(), weak=True)
+    response.make_conditional(request)
+    if response.status_code == 304:
+        return response
+
+    if compressible and len(body) >= COMPRESS_MIN_SIZE and 'Content-Encoding' not in response.headers:
+        encoding, encoded = encode_body(body)
+        if encoding:
+            response.set_data(encoded)
+            response.headers['Content-Encoding'] = encoding
+    return response
+
 # Imposta il dominio StreamingCommunity da usare
-sc = API('streamingcommunity.lu')  # Assicurati che il dominio sia corretto e in minuscolo
+# Mirror in ordine di preferenza, separati da virgola: con più domini vengono verificati ogni SC_PROBE_INTERVAL secondi
+SC_DOMAINS = [domain.strip().lower() for domain in os.getenv('SC_DOMAINS', 'streamingcommunity.lu').split(',') if domain.strip()]
+sc = API(
+    SC_DOMAINS,
+    pool_maxsize=int(os.getenv('SC_POOL_MAXSIZE', 20)),
+    # Cache dei link m3u8: ogni voce scade LINKS_EXPIRY_MARGIN secondi prima del token
+    links_cache=TTLCache(maxsize=int(os.getenv('LINKS_CACHE_SIZE', 2048))),
+    links_expiry_margin=int(os.getenv('LINKS_EXPIRY_MARGIN', 120)),
+    # Cache a lunga durata di embedUrl e URL dell'iframe: al rinnovo del token serve solo la pagina dell'iframe
+    stages_cache=TTLCache(
+        maxsize=int(os.getenv('LINK_STAGES_CACHE_SIZE', 8192)),
+        ttl=int(os.getenv('LINK_STAGES_TTL', 7 * 24 * 3600)),
+    ),
+    observer=record_upstream,
+    # Ripetizioni con jitter delle GET, richiesta duplicata oltre il percentile SC_HEDGE_PERCENTILE (se impostato)
+    retry_policy=RetryPolicy(
+        retries=int(os.getenv('SC_RETRIES', 1)),
+        backoff=float(os.getenv('SC_RETRY_BACKOFF', 0.2)),
+        hedge_percentile=float(os.environ['SC_HEDGE_PERCENTILE']) if os.getenv('SC_HEDGE_PERCENTILE') else None,
+    ),
+    # Circuit breaker per host: dopo SC_BREAKER_THRESHOLD errori consecutivi (0 per disattivarlo)
+    breaker_threshold=int(os.getenv('SC_BREAKER_THRESHOLD', 5)),
+    breaker_cooldown=float(os.getenv('SC_BREAKER_COOLDOWN', 30)),
+    probe_interval=float(os.getenv('SC_PROBE_INTERVAL', 300)),
+)
+CACHES['links'] = sc.links_cache
+CACHES['link_stages'] = sc.stages_cache
+
+metrics.gauge('upstream_retries', 'Tentativi ripetuti verso StreamingCommunity e vixcloud', [], lambda: {(): sc.upstream_stats()['retries']})
+metrics.gauge('upstream_hedged_requests', 'Richieste duplicate oltre il percentile di latenza', [], lambda: {(): sc.upstream_stats()['hedges']})
+metrics.gauge(
+    'upstream_circuit_open', 'Circuit breaker aperto (1) o chiuso (0) per host', ['host'],
+    lambda: {(host,): int(state == 'open') for host, state in sc.upstream_stats()['breakers'].items()},
+)
+metrics.gauge(
+    'upstream_mirror_active', 'Mirror StreamingCommunity attivo (1) o di riserva (0)', ['domain'],
+    lambda: {(mirror['domain'],): int(mirror['active']) for mirror in sc.mirror_status()},
+)
+metrics.gauge(
+    'upstream_mirror_latency_seconds', "Latenza dell'ultima verifica riuscita di ogni mirror", ['domain'],
+    lambda: {(mirror['domain'],): mirror['latency'] for mirror in sc.mirror_status() if mirror['ok']},
+)
 
 # TMDb API key (utilizza una variabile d'ambiente per sicurezza)
 TMDB_API_KEY = os.getenv('TMDB_API_KEY', 'bec469490202847eee0bec57cfe9349a')  # Sostituisci con il tuo metodo di gestione delle chiavi
 TMDB_API_URL = 'https://api.themoviedb.org/3/'
 
+# Sessione HTTP condivisa (keep-alive) per le chiamate a TMDb
+tmdb_session = make_session(pool_maxsize=int(os.getenv('TMDB_POOL_MAXSIZE', 20)))
+
+# Cache dei metadati TMDb (cambiano raramente): TTL in secondi e numero massimo di voci
+TMDB_CACHE_TTL = int(os.getenv('TMDB_CACHE_TTL', 24 * 3600))
+TMDB_CACHE_SIZE = int(os.getenv('TMDB_CACHE_SIZE', 4096))
+tmdb_cache = TTLCache(maxsize=TMDB_CACHE_SIZE, ttl=TMDB_CACHE_TTL)
+CACHES['tmdb'] = tmdb_cache
+
+# Indice persistente IMDb ID -> StreamingCommunity (con cache dei "nessuna corrispondenza")
+resolution_index = ResolutionIndex(
+    os.getenv('RESOLUTION_INDEX_PATH', 'resolution_index.sqlite3'),
+    ttl=int(os.getenv('RESOLUTION_TTL', 30 * 24 * 3600)),
+    negative_ttl=int(os.getenv('RESOLUTION_NEGATIVE_TTL', 6 * 3600)),
+)
+CACHES['resolution'] = resolution_index
+metrics.gauge('resolution_negative_hits', 'Hit dell\'indice che hanno restituito un "nessuna corrispondenza"', [],
+              lambda: {(): resolution_index.stats()['negative_hits']})
+
+# Catalogo locale dei titoli StreamingCommunity, consultato prima della ricerca live (CATALOG_PATH vuoto per disattivarlo)
+CATALOG_PATH = os.getenv('CATALOG_PATH', 'catalog.sqlite3')
+catalog = CatalogIndex(CATALOG_PATH) if CATALOG_PATH else None
+# Punteggio minimo (0-100) perché un titolo del catalogo diventi un candidato
+CATALOG_MIN_SCORE = float(os.getenv('CATALOG_MIN_SCORE', 80))
+# Completamento in background degli IMDb ID mancanti: intervallo in secondi (0 per disattivarlo),
+# titoli per giro e attesa prima di riverificare un titolo senza IMDb ID
+CATALOG_REFRESH_INTERVAL = int(os.getenv('CATALOG_REFRESH_INTERVAL', 0))
+CATALOG_REFRESH_BATCH = int(os.getenv('CATALOG_REFRESH_BATCH', 20))
+CATALOG_RECHECK_AFTER = int(os.getenv('CATALOG_RECHECK_AFTER', 7 * 24 * 3600))
+
+# Coalescenza delle chiamate identiche in corso verso TMDb e StreamingCommunity
+flight = SingleFlight()
+# Un chiamante servito da una chiamata già in corso conta come hit
+CACHES['flight'] = flight
+
+# Dati di `load` e delle stagioni: le serie richieste spesso vengono aggiornate in background prima della
+# scadenza e, nel frattempo, le richieste ricevono l'ultima copia valida (fino a LOAD_MAX_STALE secondi dopo LOAD_TTL)
+series_cache = RefreshScheduler(
+    ttl=int(os.getenv('LOAD_TTL', 3600)),
+    max_stale=int(os.getenv('LOAD_MAX_STALE', 24 * 3600)),
+    maxsize=int(os.getenv('LOAD_CACHE_SIZE', 512)),
+    hot_hits=int(os.getenv('LOAD_HOT_HITS', 2)),
+    refresh_ahead=int(os.getenv('LOAD_REFRESH_AHEAD', 300)),
+    # Aggiornamenti in background consentiti al minuto per ogni chiamata esterna
+    budgets={
+        'load': RefreshBudget(float(os.getenv('REFRESH_BUDGET_LOAD', 30))),
+        'season': RefreshBudget(float(os.getenv('REFRESH_BUDGET_SEASON', 60))),
+    },
+    workers=int(os.getenv('REFRESH_WORKERS', 2)),
+    interval=int(os.getenv('REFRESH_INTERVAL', 30)),
+)
+CACHES['series'] = series_cache
+metrics.gauge(
+    'series_refresh', 'Aggiornamenti in background dei dati delle serie per esito', ['outcome'],
+    lambda: {(name,): value for name, value in series_cache.stats().items()
+             if name in ('stale_served', 'refreshes', 'refresh_errors', 'budget_skips', 'hot')},
+)
+
+# Una sola copia per serie, in formato compatto: /load la converte con `to_dict()`
+def load_series(slug_for_load):
+    return series_cache.get(('load', slug_for_load), sc.load, slug_for_load, compact=True, upstream='load')
+
+# Ogni stagione è una `Series` compatta con i soli suoi episodi, indicizzati per (stagione, episodio)
+def load_season(slug_for_load, season):
+    return series_cache.get(('load_season', slug_for_load, season), sc.load_season, slug_for_load, season, compact=True, upstream='season')
+
+# Stagioni ricaricate di recente perché mancava un episodio, per non ricaricarle a ogni richiesta di un episodio inesistente
+SEASON_RELOAD_INTERVAL = int(os.getenv('SEASON_RELOAD_INTERVAL', 60))
+season_reloads = TTLCache(maxsize=int(os.getenv('LOAD_CACHE_SIZE', 512)), ttl=SEASON_RELOAD_INTERVAL)
+
+# Cerca un episodio nella stagione in cache; se manca (es. appena pubblicato) ricarica la stagione una volta
+def find_episode(slug_for_load, season, episode, season_episodes):
+    episode_info = season_episodes.episode(season, episode)
+    if episode_info is None and season_reloads.get((slug_for_load, season)) is None:
+        season_reloads.set((slug_for_load, season), True)
+        series_cache.invalidate(('load_season', slug_for_load, season))
+        try:
+            season_episodes = load_season(slug_for_load, season)
+        except Exception as e:
+            logging.debug("Ricaricamento della stagione %s non riuscito per slug '%s': %s", season, slug_for_load, e)
+        else:
+            episode_info = season_episodes.episode(season, episode)
+    return episode_info, season_episodes
+
+# Numero di candidati verificati in parallelo in find_best_match
+PROBE_WORKERS = int(os.getenv('PROBE_WORKERS', 5))
+
+# Risultati della ricerca considerati da find_best_match: quelli verificati per IMDb ID e quelli valutati per similarità
+MATCH_PROBE_TOP_N = int(os.getenv('MATCH_PROBE_TOP_N', 5))
+MATCH_SCORE_TOP_N = int(os.getenv('MATCH_SCORE_TOP_N', 5))
+
+# Numero di titoli normalizzati tenuti in memoria
+NORMALIZE_CACHE_SIZE = int(os.getenv('NORMALIZE_CACHE_SIZE', 4096))
+
+# Limiti dell'endpoint batch /get_episodes_info
+BATCH_MAX_KEYS = int(os.getenv('BATCH_MAX_KEYS', 100))
+BATCH_WORKERS = int(os.getenv('BATCH_WORKERS', 8))
+
+# Prefetch dei link degli episodi successivi a quello richiesto (PREFETCH_EPISODES=0 per disattivarlo):
+# thread dedicati, numero massimo di prefetch in attesa e richieste dei client oltre cui il prefetch si ferma
+PREFETCH_EPISODES = int(os.getenv('PREFETCH_EPISODES', 2))
+PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', 2))
+PREFETCH_MAX_QUEUE = int(os.getenv('PREFETCH_MAX_QUEUE', 32))
+PREFETCH_MAX_FOREGROUND = int(os.getenv('PREFETCH_MAX_FOREGROUND', 8))
+prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch') if PREFETCH_EPISODES > 0 else None
+prefetch_queued = 0
+prefetch_lock = threading.Lock()
+# Stagioni successive risultate inesistenti, per non richiederle a ogni episodio dell'ultima stagione
+missing_seasons = TTLCache(maxsize=int(os.getenv('LOAD_CACHE_SIZE', 512)), ttl=int(os.getenv('LOAD_TTL', 3600)))
+CACHES['missing_seasons'] = missing_seasons
+prefetch_total = metrics.counter('prefetch_total', 'Prefetch degli episodi successivi per esito', ['outcome'])
+
 # Inizializza il traduttore
 translator = GoogleTranslator(source='auto', target='it')
 
+# Cache persistente delle traduzioni dei titoli
+translation_cache = TranslationCache(os.getenv('TRANSLATION_CACHE_PATH', 'translations.sqlite3'), target='it')
+CACHES['translations'] = translation_cache
+
+# Funzione per ottenere in un'unica richiesta i dettagli in italiano, i titoli alternativi e gli ID esterni di una serie TV
+def get_tv_details(tmdb_id):
+    cached = tmdb_cache.get(('details', tmdb_id))
+    if cached is not None:
+        return cached
+    try:
+        with upstream_timer('tmdb_details'):
+            response = tmdb_session.get(
+                f"{TMDB_API_URL}tv/{tmdb_id}",
+                params={
+                    "api_key": TMDB_API_KEY,
+                    "language": "it-IT",
+                    "append_to_response": "alternative_titles,external_ids",
+                },
+                timeout=5
+            )
+        if response.status_code == 200:
+            details_data = response.json()
+            tmdb_cache.set(('details', tmdb_id), details_data)
+            return details_data
+        logging.error("Errore nel recuperare i dettagli per TMDb ID %s: %s", tmdb_id, response.status_code)
+    except requests.exceptions.RequestException as e:
+        logging.error("Richiesta dei dettagli TMDb fallita per TMDb ID %s: %s", tmdb_id, e)
+    return None
+
 # Funzione per ottenere il titolo e l'anno dalla piattaforma IMDb tramite TMDb API
 def get_title_from_imdb(imdb_id):
+    cached = tmdb_cache.get(('title', imdb_id))
+    if cached is not None:
+        return cached
     try:
         # Effettua una richiesta all'API di TMDb per trovare il titolo tramite IMDb ID
-        response = requests.get(
-            f"{TMDB_API_URL}find/{imdb_id}",
-            params={"api_key": TMDB_API_KEY, "external_source": "imdb_id"},
-            timeout=5
-        )
+        with upstream_timer('tmdb_find'):
+            response = tmdb_session.get(
+                f"{TMDB_API_URL}find/{imdb_id}",
+                params={"api_key": TMDB_API_KEY, "external_source": "imdb_id"},
+                timeout=5
+            )
         if response.status_code == 200:
             data = response.json()
-            logging.debug(f"TMDb Response Data for IMDb ID {imdb_id}: {data}")
+            logging.debug("TMDb Response Data for IMDb ID %s: %s", imdb_id, Summary(data))
             # Gestione dei risultati delle serie TV
             if data.get("tv_results"):
                 tv_data = data["tv_results"][0]  # Prendi il primo risultato
                 tmdb_id = tv_data["id"]
-                logging.debug(f"Selected TMDb ID for IMDb ID {imdb_id}: {tmdb_id}")
-                # Recupera i dettagli della serie TV in italiano
-                details_response = requests.get(
-                    f"{TMDB_API_URL}tv/{tmdb_id}",
-                    params={"api_key": TMDB_API_KEY, "language": "it-IT"},
-                    timeout=5
-                )
-                if details_response.status_code == 200:
-                    details_data = details_response.json()
+                logging.debug("Selected TMDb ID for IMDb ID %s: %s", imdb_id, tmdb_id)
+                # Recupera dettagli in italiano e titoli alternativi con una sola richiesta
+                details_data = get_tv_details(tmdb_id)
+                if details_data is not None:
                     title_it = details_data.get("name", tv_data["name"]).lower()
                 else:
+                    details_data = {}
                     title_it = tv_data["name"].lower()
-                    logging.warning(f"Impossibile ottenere dettagli in italiano per TMDb ID {tmdb_id}. Usando titolo originale: {title_it}")
-
-                # Recupera titoli alternativi
-                alt_titles_response = requests.get(
-                    f"{TMDB_API_URL}tv/{tmdb_id}/alternative_titles",
-                    params={"api_key": TMDB_API_KEY},
-                    timeout=5
-                )
+                    logging.warning("Impossibile ottenere dettagli in italiano per TMDb ID %s. Usando titolo originale: %s", tmdb_id, title_it)
+
                 alternative_titles = []
-                if alt_titles_response.status_code == 200:
-                    alt_titles_data = alt_titles_response.json()
-                    for title_info in alt_titles_data.get('results', []):
-                        title = title_info.get('title', '').strip().lower()
-                        if title and 'perched' not in title:  # Escludi "Perched" se non pertinente
-                            alternative_titles.append(title)
-
-                return {
+                for title_info in details_data.get('alternative_titles', {}).get('results', []):
+                    title = title_info.get('title', '').strip().lower()
+                    if title and 'perched' not in title:  # Escludi "Perched" se non pertinente
+                        alternative_titles.append(title)
+
+                title_info = {
                     "title": title_it,
                     "original_title": tv_data["original_name"].lower(),
                     "alternative_titles": alternative_titles,
@@ -77,31 +425,24 @@ def get_title_from_imdb(imdb_id):
                     "code": tv_data.get('id'),  # Codice TMDb
                     "imdb_id": imdb_id
                 }
-        logging.error(f"Errore durante l'ottenimento dei metadati da IMDb ID '{imdb_id}' con TMDb: {response.status_code}")
+                tmdb_cache.set(('title', imdb_id), title_info)
+                return title_info
+        logging.error("Errore durante l'ottenimento dei metadati da IMDb ID '%s' con TMDb: %s", imdb_id, response.status_code)
     except requests.exceptions.RequestException as e:
-        logging.error(f"Richiesta TMDb fallita: {e}")
+        logging.error("Richiesta TMDb fallita: %s", e)
     return None
 
-# Funzione per ottenere l'IMDb ID da TMDb utilizzando il tmdb_id
+# Funzione per ottenere l'IMDb ID da TMDb utilizzando il tmdb_id (riusa la richiesta consolidata dei dettagli)
 def get_imdb_id(tmdb_id):
-    try:
-        response = requests.get(
-            f"{TMDB_API_URL}tv/{tmdb_id}/external_ids",
-            params={"api_key": TMDB_API_KEY},
-            timeout=5
-        )
-        if response.status_code == 200:
-            data = response.json()
-            imdb_id = data.get('imdb_id', '').lower()
-            logging.debug(f"Fetched IMDb ID '{imdb_id}' for TMDb ID {tmdb_id}")
-            return imdb_id
-        else:
-            logging.error(f"Errore nel recuperare l'IMDb ID per TMDb ID {tmdb_id}: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Richiesta per ottenere l'IMDb ID fallita per TMDb ID {tmdb_id}: {e}")
-    return ''
+    details_data = get_tv_details(tmdb_id)
+    if details_data is None:
+        return ''
+    imdb_id = (details_data.get('external_ids', {}).get('imdb_id') or '').lower()
+    logging.debug("Fetched IMDb ID '%s' for TMDb ID %s", imdb_id, tmdb_id)
+    return imdb_id
 
 # Funzione per normalizzare il testo
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize(text):
     if not text:
         return ''
@@ -114,48 +455,193 @@ def normalize(text):
     text = re.sub(r'\s+', ' ', text).strip()
     return text
 
-# Funzione per calcolare la somiglianza tra i titoli
-def calculate_title_similarity(title1, title2):
-    similarity = fuzz.WRatio(title1, title2) / 100  # RapidFuzz restituisce un valore tra 0 e 100
-    logging.debug(f"Calculated similarity between '{title1}' and '{title2}': {similarity}")
-    return similarity
+# Statistiche della cache di normalize nello stesso formato delle altre cache
+class LruCacheStats:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def stats(self):
+        info = self.fn.cache_info()
+        lookups = info.hits + info.misses
+        return {'size': info.currsize, 'hits': info.hits, 'misses': info.misses,
+                'hit_ratio': info.hits / lookups if lookups else 0.0}
+
+CACHES['normalize'] = LruCacheStats(normalize)
+
+# Funzione per calcolare, per ogni candidato, la massima somiglianza con i titoli di riferimento.
+# Ogni riferimento viene confrontato con tutti i candidati in una sola chiamata a rapidfuzz.
+def max_title_similarities(candidates, references):
+    best = [0.0] * len(candidates)
+    if not candidates:
+        return best
+    for reference in references:
+        for _, score, index in process.extract(reference, candidates, scorer=fuzz.WRatio, limit=None):
+            # RapidFuzz restituisce un valore tra 0 e 100
+            best[index] = max(best[index], score / 100)
+    return best
 
 # Funzione per tradurre un titolo in italiano
 def translate_title(title):
     try:
-        translated_title = translator.translate(title).lower()
-        logging.debug(f"Translated title from '{title}' to '{translated_title}'")
+        with upstream_timer('translate'):
+            translated_title = translator.translate(title).lower()
+        logging.debug("Translated title from '%s' to '%s'", title, translated_title)
         return translated_title
     except Exception as e:
-        logging.error(f"Errore durante la traduzione del titolo '{title}': {e}")
+        logging.error("Errore durante la traduzione del titolo '%s': %s", title, e)
         return ''
 
-def find_best_match(search_results, title_info):
-    # Considera solo i primi 5 risultati
-    top_results = search_results[:5]
-    logging.debug(f"Top 5 search result titles: {[result.get('name', '') for result in top_results]}")
+# Funzione per tradurre più titoli in italiano con una sola chiamata, usando la cache persistente
+def translate_titles(titles):
+    titles = [title for title in dict.fromkeys(titles) if title and title.strip()]
+    translations = translation_cache.get_many(titles)
+    missing = [title for title in titles if title not in translations]
+    if missing:
+        logging.debug("Traduzioni non in cache: %s", missing)
+        # I titoli vengono uniti su righe separate e tradotti in un'unica richiesta
+        batch = translate_title('\n'.join(missing))
+        if not batch:
+            # Traduttore non disponibile: ripetere la richiesta per ogni titolo moltiplicherebbe solo gli errori
+            return [translations[title] for title in titles if title in translations]
+        translated = batch.split('\n')
+        if len(translated) != len(missing):
+            logging.warning("Traduzione batch non allineata, traduco i titoli singolarmente")
+            translated = [translate_title(title) for title in missing]
+        new_translations = {
+            title: result.strip().lower()
+            for title, result in zip(missing, translated)
+            if result.strip()
+        }
+        translation_cache.put_many(new_translations)
+        translations.update(new_translations)
+    return [translations[title] for title in titles if title in translations]
+
+# Nomi normalizzati del catalogo: a ogni nuova versione vengono normalizzati solo i nomi aggiunti o cambiati
+_catalog_names = (None, [], [])
+_catalog_positions = {}
+_catalog_names_lock = threading.Lock()
+
+def catalog_names():
+    global _catalog_names
+    if _catalog_names[0] != catalog.version:
+        with _catalog_names_lock:
+            if _catalog_names[0] != catalog.version:
+                since, ids, names = _catalog_names
+                version, changes = catalog.name_changes(since)
+                # Nuove liste, così chi sta leggendo le precedenti non le vede cambiare
+                ids, names = list(ids), list(names)
+                for sc_id, name in changes:
+                    # Senza passare dalla cache di normalize, che servirebbe solo per questi titoli
+                    normalized = normalize.__wrapped__(name.lower())
+                    position = _catalog_positions.get(sc_id)
+                    if position is None:
+                        _catalog_positions[sc_id] = len(ids)
+                        ids.append(sc_id)
+                        names.append(normalized)
+                    else:
+                        names[position] = normalized
+                _catalog_names = (version, ids, names)
+    return _catalog_names[1], _catalog_names[2]
+
+# Trasforma una riga del catalogo in un risultato con lo stesso formato di sc.search
+def catalog_result(entry):
+    entry['url'] = sc._title_url(f"{entry['id']}-{entry['slug']}")
+    return entry
+
+# Funzione per cercare i candidati nel catalogo locale confrontando titolo italiano e originale
+def search_catalog(title_info):
+    if catalog is None:
+        return []
+    ids, names = catalog_names()
+    if not ids:
+        return []
+    scores = {}
+    for title in dict.fromkeys([title_info.get('title', ''), title_info.get('original_title', '')]):
+        query = normalize(title.lower())
+        if not query:
+            continue
+        matches = process.extract(query, names, scorer=fuzz.WRatio, limit=MATCH_SCORE_TOP_N, score_cutoff=CATALOG_MIN_SCORE)
+        for _, score, index in matches:
+            scores[ids[index]] = max(scores.get(ids[index], 0), score)
+    best_ids = sorted(scores, key=scores.get, reverse=True)[:MATCH_SCORE_TOP_N]
+    return [catalog_result(entry) for entry in catalog.get_many(best_ids)]
+
+# Registra nel catalogo gli ID esterni letti dalla pagina di un titolo
+def remember_identity(identity):
+    if catalog is not None and identity.get('id') is not None:
+        catalog.set_ids(identity['id'], identity.get('tmdb_id'), identity.get('imdb_id'))
+
+# Completa un blocco di titoli del catalogo ancora senza IMDb ID
+def refresh_catalog_ids():
+    for entry in catalog.unchecked(CATALOG_REFRESH_BATCH, time.time() - CATALOG_RECHECK_AFTER):
+        slug = f"{entry['id']}-{entry['slug']}"
+        try:
+            remember_identity(flight.do(('identity', slug), sc.identity, slug))
+        except Exception as e:
+            logging.warning("Aggiornamento del catalogo fallito per slug '%s': %s", slug, e)
+            # Segna comunque il titolo come verificato, per riprovarlo solo dopo CATALOG_RECHECK_AFTER
+            catalog.set_ids(entry['id'])
+
+def catalog_refresher():
+    while True:
+        time.sleep(CATALOG_REFRESH_INTERVAL)
+        try:
+            refresh_catalog_ids()
+        except Exception as e:
+            logging.error("Errore durante l'aggiornamento del catalogo: %s", e)
 
-    # 1. Estrai e confronta l'`imdb_id` di ciascun risultato con quello fornito da Stremio
-    for result in top_results:
-        # Estrai l'URL
-        url = result['url']
-        
+if catalog is not None and CATALOG_REFRESH_INTERVAL > 0:
+    threading.Thread(target=catalog_refresher, name='catalog-refresher', daemon=True).start()
+
+# Funzione per verificare in parallelo l'`imdb_id` dei candidati, leggendo solo i dati identificativi
+def find_exact_match(results, imdb_id):
+    if not results or not imdb_id:
+        return None
+
+    def probe(result):
+        # Gli ID già noti al catalogo non richiedono di scaricare la pagina del titolo
+        if result.get('imdb_id'):
+            return result['imdb_id'].lower()
         # Estrai lo slug dall'URL (la parte finale)
-        slug = url.split('/')[-1]
-        
-        # Usa sc.load per ottenere i dettagli completi
+        slug = result['url'].split('/')[-1]
         try:
-            details = sc.load(slug)
-            fetched_imdb_id = details.get('imdb_id', '').lower()
-            logging.debug(f"Fetched IMDb ID for result '{result.get('name')}': {fetched_imdb_id}")
-            
-            # Confronta con l'IMDb ID fornito da Stremio
-            if fetched_imdb_id == title_info.get('imdb_id', '').lower():
-                logging.debug(f"Risultato con `imdb_id` corrispondente trovato: {result.get('name')}")
-                return result  # Ritorna immediatamente il match esatto
+            identity = flight.do(('identity', slug), sc.identity, slug)
+            remember_identity(identity)
+            fetched_imdb_id = (identity.get('imdb_id') or '').lower()
+            logging.debug("Fetched IMDb ID for result '%s': %s", result.get('name'), fetched_imdb_id)
+            return fetched_imdb_id
         except Exception as e:
-            logging.error(f"Errore durante il caricamento dei dettagli per slug '{slug}': {e}")
-            continue
+            logging.error("Errore durante il caricamento dei dettagli per slug '%s': %s", slug, e)
+            return ''
+
+    executor = ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(results)))
+    try:
+        probe = with_log_context(probe)
+        futures = [executor.submit(probe, result) for result in results]
+        # In ordine di ricerca: vince il primo risultato corrispondente, come nella verifica sequenziale,
+        # anche se un candidato successivo risponde prima
+        for result, future in zip(results, futures):
+            if future.result() == imdb_id:
+                logging.debug("Risultato con `imdb_id` corrispondente trovato: %s", result.get('name'))
+                return result
+    finally:
+        # Non attendere i candidati successivi al match esatto: quelli precedenti sono già tutti terminati
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
+
+# `extra_candidates` (es. dal catalogo locale) vengono valutati per similarità insieme ai risultati, senza verificarne l'IMDb ID
+def find_best_match(search_results, title_info, extra_candidates=()):
+    # Considera solo i primi MATCH_SCORE_TOP_N risultati, più i candidati aggiuntivi non già presenti
+    top_results = search_results[:MATCH_SCORE_TOP_N]
+    top_ids = {result.get('id') for result in top_results}
+    top_results = top_results + [result for result in extra_candidates if result.get('id') not in top_ids]
+    if DEBUG_ENABLED:
+        logging.debug("Top %d search result titles: %s", MATCH_SCORE_TOP_N, [result.get('name', '') for result in top_results])
+
+    # 1. Estrai e confronta l'`imdb_id` dei primi risultati con quello fornito da Stremio
+    match = find_exact_match(search_results[:MATCH_PROBE_TOP_N], title_info.get('imdb_id', '').lower())
+    if match:
+        return match  # Ritorna immediatamente il match esatto
 
     # 2. Se nessun match esatto, procede con la logica di punteggio basata sulla similarità
     best_match = None
@@ -181,21 +667,25 @@ def find_best_match(search_results, title_info):
 
         # Estrai e logga il tipo
         result_type = result.get('type', '').lower()
-        logging.debug(f"Result: {result.get('name')}, Type: {result_type}, Year: {result_year}")
+        logging.debug("Result: %s, Type: %s, Year: %s", result.get('name'), result_type, result_year)
 
         if result_year == tmdb_year and 'tv' in result_type:
             filtered_results.append(result)
 
     # Log dei risultati filtrati
-    filtered_titles = [result.get('name', '') for result in filtered_results]
-    logging.debug(f"Filtered Results by Year ({tmdb_year}) and Type 'tv' titles: {filtered_titles}")
+    if DEBUG_ENABLED:
+        logging.debug("Filtered Results by Year (%s) and Type 'tv' titles: %s", tmdb_year, [result.get('name', '') for result in filtered_results])
 
     if not filtered_results:
-        logging.warning(f"Nessun risultato trovato su StreamingCommunity per l'anno: {tmdb_year}")
+        logging.warning("Nessun risultato trovato su StreamingCommunity per l'anno: %s", tmdb_year)
         return None  # Nessun match possibile
 
-    # Traduci il titolo della serie TV in italiano
-    translated_title_it = translate_title(title_info.get('title', ''))
+    # Usa il titolo italiano di TMDb se differisce dall'originale, altrimenti traduci titolo e titoli alternativi
+    title_it = title_info.get('title', '')
+    if title_it and title_it.lower() != title_info.get('original_title', '').lower():
+        translated_titles_it = [title_it]
+    else:
+        translated_titles_it = translate_titles([title_it] + title_info.get('alternative_titles', []))
 
     # Preparazione dei titoli per il confronto
     original_titles = [
@@ -203,36 +693,35 @@ def find_best_match(search_results, title_info):
     ]
     original_titles.extend([title.lower() for title in title_info.get('alternative_titles', []) if title.strip()])
 
-    italian_titles = []
-    if translated_title_it:
-        italian_titles.append(translated_title_it.lower())
+    italian_titles = [title.lower() for title in translated_titles_it]
 
     # Normalizza i titoli
     original_titles = [normalize(title) for title in original_titles if title.strip()]
     italian_titles = [normalize(title) for title in italian_titles if title.strip()]
 
-    logging.debug(f"Normalized Original Titles: {original_titles}")
-    logging.debug(f"Normalized Italian Titles: {italian_titles}")
-
-    for result in filtered_results:
-        result_title = result.get('name', '').lower()
-        normalized_result_title = normalize(result_title)
+    logging.debug("Normalized Original Titles: %s", original_titles)
+    logging.debug("Normalized Italian Titles: %s", italian_titles)
 
-        # Calcola le similarità
-        similarity_original = max([calculate_title_similarity(normalized_result_title, t) for t in original_titles] or [0])
-        similarity_italian = max([calculate_title_similarity(normalized_result_title, t) for t in italian_titles] or [0])
+    # Calcola le similarità di tutti i candidati in blocco
+    result_titles = [result.get('name', '').lower() for result in filtered_results]
+    normalized_result_titles = [normalize(title) for title in result_titles]
+    similarities_original = max_title_similarities(normalized_result_titles, original_titles)
+    similarities_italian = max_title_similarities(normalized_result_titles, italian_titles)
 
+    for result, result_title, similarity_original, similarity_italian in zip(
+        filtered_results, result_titles, similarities_original, similarities_italian
+    ):
         # Calcola il punteggio con peso maggiore per similarità italiana
         score = similarity_original + (similarity_italian * 1.5)
 
         # Bonus aggiuntivo per alta similarità
         if similarity_original > 0.8 or similarity_italian > 0.8:
             score += 1.0  # Bonus per alta similarità
-            logging.debug(f"Bonus alta similarità applicato per {result.get('name')}")
+            logging.debug("Bonus alta similarità applicato per %s", result.get('name'))
 
         logging.debug(
-            f"Evaluating Result: {result_title}, Similarity Original: {similarity_original:.2f}, "
-            f"Similarity Italian: {similarity_italian:.2f}, Score: {score:.2f}"
+            "Evaluating Result: %s, Similarity Original: %.2f, Similarity Italian: %.2f, Score: %.2f",
+            result_title, similarity_original, similarity_italian, score
         )
 
         # Aggiorna il best_match se il punteggio è il più alto
@@ -242,82 +731,105 @@ def find_best_match(search_results, title_info):
 
     # Log del best match selezionato
     if best_match:
-        logging.debug(f"Best Match Selected: {best_match.get('name')} with score {max_score:.2f}")
+        logging.debug("Best Match Selected: %s with score %.2f", best_match.get('name'), max_score)
     else:
         logging.debug("No best match found.")
 
     return best_match
 
-# Endpoint per ottenere le informazioni dell'episodio tramite IMDb ID, stagione e episodio
-@app.route('/get_episode_info', methods=['GET'])
-def get_episode_info():
-    imdb_season_episode = request.args.get('imdb_season_episode')
-    if not imdb_season_episode:
-        logging.warning("Parametri IMDb ID, stagione o episodio non forniti.")
-        return jsonify({"error": "IMDb ID, stagione o episodio non forniti"}), 400
+# Indica se l'errore è un 404/410, cioè una pagina che non esiste (più)
+def is_gone(error):
+    return isinstance(error, WebPageStatusCodeError) and error.status_code in (404, 410)
+
+# Funzione per dimenticare la corrispondenza salvata di un IMDb ID quando il titolo non esiste più (rimosso o spostato).
+# Con `title_page=False` l'errore viene da una pagina di stagione: una stagione inesistente non rende la corrispondenza
+# sbagliata, quindi prima si verifica che sia sparita anche la pagina del titolo.
+def forget_stale_resolution(imdb_id, slug_for_load, error, title_page=True):
+    if not is_gone(error):
+        return
+    if not title_page:
+        try:
+            flight.do(('identity', slug_for_load), sc.identity, slug_for_load)
+            return
+        except Exception as e:
+            if not is_gone(e):
+                return
+    logging.info("Titolo non più disponibile, corrispondenza rimossa per IMDb ID: %s", imdb_id)
+    resolution_index.invalidate(imdb_id)
+
+# Funzione per risolvere un IMDb ID nello slug StreamingCommunity, consultando prima l'indice persistente
+def resolve_series(imdb_id):
+    cached = resolution_index.get(imdb_id)
+    if cached is NO_MATCH:
+        logging.debug("Nessuna corrispondenza in cache per IMDb ID: %s", imdb_id)
+        return None, ("Nessuna corrispondenza trovata", 404)
+    if cached:
+        slug_for_load = f"{cached['id']}-{cached['slug']}" if cached['slug'] else str(cached['id'])
+        logging.debug("Corrispondenza in cache per IMDb ID %s: %s", imdb_id, slug_for_load)
+        return slug_for_load, None
+
+    # Corrispondenza esatta nel catalogo locale: niente TMDb, ricerca né punteggio
+    entry = catalog.by_imdb_id(imdb_id) if catalog is not None else None
+    if entry and 'tv' in (entry.get('type') or '').lower():
+        slug_for_load = f"{entry['id']}-{entry['slug']}" if entry['slug'] else str(entry['id'])
+        logging.debug("Corrispondenza nel catalogo per IMDb ID %s: %s", imdb_id, slug_for_load)
+        resolution_index.put(imdb_id, entry['id'], entry['slug'], entry['name'])
+        return slug_for_load, None
+
+    title_info = flight.do(('title', imdb_id), get_title_from_imdb, imdb_id)
+    if not title_info or title_info['type'] != 'tv':
+        logging.error("Trovato titolo non valido o non è una serie TV per IMDb ID: %s", imdb_id)
+        return None, ("Titolo non trovato o non è una serie TV", 404)
 
-    try:
-        imdb_id, season, episode = imdb_season_episode.split(":")
-        logging.debug(f"Parametri ricevuti - IMDb ID: {imdb_id}, Stagione: {season}, Episodio: {episode}")
-    except ValueError:
-        logging.error(f"Formato IMDb season episode errato: {imdb_season_episode}")
-        return jsonify({"error": "Formato IMDb season episode errato. Dovrebbe essere tt1234567:1:1"}), 400
+    logging.debug("Informazioni del titolo: %s", title_info)
 
-    title_info = get_title_from_imdb(imdb_id)
-    if not title_info or title_info['type'] != 'tv':
-        logging.error(f"Trovato titolo non valido o non è una serie TV per IMDb ID: {imdb_id}")
-        return jsonify({"error": "Titolo non trovato o non è una serie TV"}), 404
+    # Un candidato del catalogo locale evita la ricerca live solo se il suo IMDb ID corrisponde: il catalogo contiene
+    # solo i titoli visti in ricerche precedenti, quindi un titolo simile non basta
+    best_match = None
+    candidates = search_catalog(title_info)
+    if candidates:
+        if DEBUG_ENABLED:
+            logging.debug("Candidati dal catalogo: %s", [result.get('name', '') for result in candidates])
+        best_match = find_exact_match(candidates[:MATCH_PROBE_TOP_N], imdb_id.lower())
 
-    logging.debug(f"Informazioni del titolo: {title_info}")
+    if not best_match:
+        try:
+            # Cerca su StreamingCommunity usando il titolo e l'anno
+            search_query = f"{title_info['title']} {title_info['year']}"
+            results = flight.do(('search', search_query), sc.search, search_query)
+            # Log solo i titoli dei risultati di ricerca
+            if DEBUG_ENABLED:
+                logging.debug("Risultati della ricerca per '%s': %s", search_query, [result.get('name', '') for result in results])
+        except Exception as e:
+            logging.error("Errore durante la ricerca su StreamingCommunity: %s", e)
+            return None, ("Errore durante la ricerca su StreamingCommunity", 500)
 
-    try:
-        # Cerca su StreamingCommunity usando il titolo e l'anno
-        search_query = f"{title_info['title']} {title_info['year']}"
-        results = sc.search(search_query)
-        # Log solo i titoli dei risultati di ricerca
-        search_titles = [result.get('name', '') for result in results]
-        logging.debug(f"Risultati della ricerca per '{search_query}': {search_titles}")
-    except Exception as e:
-        logging.error(f"Errore durante la ricerca su StreamingCommunity: {e}")
-        return jsonify({"error": "Errore durante la ricerca su StreamingCommunity"}), 500
+        if catalog is not None:
+            catalog.upsert_many(results)
+        # I candidati del catalogo, già verificati, partecipano solo al punteggio insieme ai risultati live
+        best_match = find_best_match(results, title_info, extra_candidates=candidates)
 
-    best_match = find_best_match(results, title_info)
     if not best_match:
-        logging.error(f"Nessuna corrispondenza trovata su StreamingCommunity per il titolo: {title_info['title']} ({title_info['year']})")
-        return jsonify({"error": "Nessuna corrispondenza trovata"}), 404
+        logging.error("Nessuna corrispondenza trovata su StreamingCommunity per il titolo: %s (%s)", title_info['title'], title_info['year'])
+        resolution_index.put_miss(imdb_id)
+        return None, ("Nessuna corrispondenza trovata", 404)
 
-    logging.debug(f"Miglior corrispondenza trovata: {best_match.get('name')}")
+    logging.debug("Miglior corrispondenza trovata: %s", best_match.get('name'))
 
     # Estrarre il codice della serie TV e lo slug
     film_code = best_match.get('id')
     slug = best_match.get('slug', '')
     slug_for_load = f"{film_code}-{slug}" if slug else str(film_code)
-    logging.debug(f"Slug for sc.load: {slug_for_load}")
+    logging.debug("Slug for sc.load: %s", slug_for_load)
 
-    # Carica i dettagli della serie TV usando sc.load con lo slug
-    try:
-        sc_data = sc.load(slug_for_load)
-        logging.debug(f"Details loaded: {sc_data}")
-    except Exception as e:
-        logging.error(f"Errore durante il caricamento dei dettagli per slug '{slug_for_load}': {e}")
-        return jsonify({"error": "Dettagli della serie TV non trovati"}), 404
-
-    # Trova l'episodio specifico
-    episode_info = next(
-        (ep for ep in sc_data.get('episodeList', []) if ep.get('season') == int(season) and ep.get('episode') == int(episode)),
-        None
-    )
-    if not episode_info:
-        logging.error(f"Episodio {episode} della stagione {season} non trovato per IMDb ID: {imdb_id}")
-        return jsonify({"error": f"Episodio {episode} della stagione {season} non trovato"}), 404
+    resolution_index.put(imdb_id, film_code, slug, best_match.get('name'))
+    return slug_for_load, None
 
-    logging.debug(f"Episodio trovato: {episode_info.get('name', 'Unknown')}")
-
-    # Estrarre il parametro combinato '8813?e=65061'
-    url = episode_info.get('url')
+# Funzione per estrarre il codice combinato '8813?e=65061' dall'URL di un episodio
+def get_episode_code(url):
     if not url:
         logging.error("URL dell'episodio non trovato.")
-        return jsonify({"error": "URL dell'episodio non trovato"}), 404
+        return None, ("URL dell'episodio non trovato", 404)
 
     try:
         parsed_url = urlparse(url)
@@ -326,7 +838,7 @@ def get_episode_info():
 
         if not e_param:
             logging.error("Parametro 'e' non trovato nell'URL dell'episodio.")
-            return jsonify({"error": "Parametro 'e' non trovato nell'URL dell'episodio"}), 404
+            return None, ("Parametro 'e' non trovato nell'URL dell'episodio", 404)
 
         code_e = e_param[0]  # '65061'
 
@@ -336,27 +848,222 @@ def get_episode_info():
             film_code = path_parts[2]  # '8813'
         else:
             logging.error("Film code non trovato nel path dell'URL dell'episodio.")
-            return jsonify({"error": "Film code non trovato nell'URL dell'episodio"}), 404
+            return None, ("Film code non trovato nell'URL dell'episodio", 404)
 
         combined_code = f"{film_code}?e={code_e}"
-        logging.debug(f"Codice combinato per sc.get_links: {combined_code}")
+        logging.debug("Codice combinato per sc.get_links: %s", combined_code)
+        return combined_code, None
     except Exception as e:
-        logging.error(f"Errore durante l'estrazione del codice combinato dall'URL: {e}")
-        return jsonify({"error": "Errore durante l'estrazione del codice combinato dall'URL dell'episodio"}), 500
+        logging.error("Errore durante l'estrazione del codice combinato dall'URL: %s", e)
+        return None, ("Errore durante l'estrazione del codice combinato dall'URL dell'episodio", 500)
+
+# Indica se le richieste dei client in corso sono troppe per lavorare in background
+def foreground_busy():
+    return foreground_in_flight > PREFETCH_MAX_FOREGROUND
+
+# Restituisce i prossimi PREFETCH_EPISODES episodi dopo quello indicato, passando alla stagione successiva se serve
+def next_episodes(slug_for_load, season, episode, season_episodes):
+    upcoming = [ep for ep in season_episodes.season(season) if ep.episode > episode][:PREFETCH_EPISODES]
+    next_key = (slug_for_load, season + 1)
+    if len(upcoming) < PREFETCH_EPISODES and not foreground_busy() and missing_seasons.get(next_key) is None:
+        try:
+            next_season = load_season(*next_key)
+        except Exception as e:
+            # Ultima stagione o stagione non disponibile
+            logging.debug("Nessuna stagione %s da precaricare per slug '%s': %s", season + 1, slug_for_load, e)
+            if isinstance(e, NoSeasonFoundError) or (isinstance(e, WebPageStatusCodeError) and e.status_code == 404):
+                missing_seasons.set(next_key, True)
+        else:
+            upcoming += next_season.season(season + 1)[:PREFETCH_EPISODES - len(upcoming)]
+    return upcoming
+
+# Scalda in background la cache dei link degli episodi successivi
+def prefetch_next(slug_for_load, season, episode, season_episodes):
+    global prefetch_queued
+    try:
+        for ep in next_episodes(slug_for_load, season, episode, season_episodes):
+            if foreground_busy():
+                prefetch_total.inc('skipped_busy')
+                return
+            combined_code, error = get_episode_code(ep.url)
+            if error:
+                continue
+            try:
+                flight.do(('get_links', combined_code), sc.get_links, combined_code)
+                prefetch_total.inc('done')
+            except Exception as e:
+                prefetch_total.inc('error')
+                logging.debug("Prefetch fallito per codice %s: %s", combined_code, e)
+    finally:
+        with prefetch_lock:
+            prefetch_queued -= 1
+
+def schedule_prefetch(slug_for_load, season, episode, season_episodes):
+    global prefetch_queued
+    if prefetch_executor is None:
+        return
+    with prefetch_lock:
+        if prefetch_queued >= PREFETCH_MAX_QUEUE or foreground_busy():
+            prefetch_total.inc('dropped')
+            return
+        prefetch_queued += 1
+    prefetch_executor.submit(prefetch_next, slug_for_load, season, episode, season_episodes)
+
+# Endpoint per ottenere le informazioni dell'episodio tramite IMDb ID, stagione e episodio
+@app.route('/get_episode_info', methods=['GET'])
+def get_episode_info():
+    imdb_season_episode = request.args.get('imdb_season_episode')
+    if not imdb_season_episode:
+        logging.warning("Parametri IMDb ID, stagione o episodio non forniti.")
+        return jsonify({"error": "IMDb ID, stagione o episodio non forniti"}), 400
+
+    try:
+        imdb_id, season, episode = imdb_season_episode.split(":")
+        season, episode = int(season), int(episode)
+        logging.debug("Parametri ricevuti - IMDb ID: %s, Stagione: %s, Episodio: %s", imdb_id, season, episode)
+    except ValueError:
+        logging.error("Formato IMDb season episode errato: %s", imdb_season_episode)
+        return jsonify({"error": "Formato IMDb season episode errato. Dovrebbe essere tt1234567:1:1"}), 400
+
+    slug_for_load, error = resolve_series(imdb_id)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
+
+    # Carica solo la stagione richiesta invece dell'intera serie
+    try:
+        season_episodes = load_season(slug_for_load, season)
+        logging.debug("Stagione %s caricata: %s episodi", season, len(season_episodes.episode_list))
+    except Exception as e:
+        logging.error("Errore durante il caricamento della stagione %s per slug '%s': %s", season, slug_for_load, e)
+        forget_stale_resolution(imdb_id, slug_for_load, e, title_page=False)
+        return jsonify({"error": "Dettagli della serie TV non trovati"}), 404
+
+    # Trova l'episodio specifico
+    episode_info, season_episodes = find_episode(slug_for_load, season, episode, season_episodes)
+    if not episode_info:
+        logging.error("Episodio %s della stagione %s non trovato per IMDb ID: %s", episode, season, imdb_id)
+        return jsonify({"error": f"Episodio {episode} della stagione {season} non trovato"}), 404
+
+    logging.debug("Episodio trovato: %s", episode_info.name or 'Unknown')
+
+    # Estrarre il parametro combinato '8813?e=65061'
+    combined_code, error = get_episode_code(episode_info.url)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
 
     # Ottenere i link di streaming utilizzando il codice combinato
     try:
-        iframe, m3u8_playlist = sc.get_links(combined_code)
-        logging.debug(f"Link ottenuti - iframe: {iframe}, m3u8_playlist: {m3u8_playlist}")
+        iframe, m3u8_playlist = flight.do(('get_links', combined_code), sc.get_links, combined_code)
+        logging.debug("Link ottenuti - iframe: %s, m3u8_playlist: %s", iframe, m3u8_playlist)
         if not m3u8_playlist:
-            logging.error(f"Playlist M3U8 non trovata per codice: {combined_code}")
+            logging.error("Playlist M3U8 non trovata per codice: %s", combined_code)
             return jsonify({"error": "Playlist M3U8 non trovata"}), 404
-        episode_info['m3u8_playlist'] = m3u8_playlist
-        return jsonify(episode_info), 200
+        # Copia: la stagione in cache è condivisa tra le richieste
+        episode_info = dict(episode_info.to_dict(), m3u8_playlist=m3u8_playlist)
     except Exception as e:
-        logging.error(f"Errore durante l'ottenimento del link m3u8 per l'episodio: {e}")
+        logging.error("Errore durante l'ottenimento del link m3u8 per l'episodio: %s", e)
         return jsonify({"error": "Playlist M3U8 non trovata"}), 404
 
+    schedule_prefetch(slug_for_load, season, episode, season_episodes)
+    return jsonify(episode_info), 200
+
+# Endpoint per risolvere più episodi in una sola richiesta (es. tt1234567:1:1,tt1234567:1:2)
+@app.route('/get_episodes_info', methods=['GET', 'POST'])
+def get_episodes_info():
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        keys = (body.get('keys') if isinstance(body, dict) else None) or []
+        if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+            return jsonify({"error": "'keys' deve essere una lista di stringhe"}), 400
+    else:
+        keys = [key for key in request.args.get('keys', '').split(',') if key]
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        logging.warning("Nessuna chiave episodio fornita nella richiesta batch.")
+        return jsonify({"error": "Nessuna chiave episodio fornita"}), 400
+    if len(keys) > BATCH_MAX_KEYS:
+        return jsonify({"error": f"Troppe chiavi: massimo {BATCH_MAX_KEYS}"}), 400
+
+    results = {}
+    parsed = {}
+    for key in keys:
+        try:
+            imdb_id, season, episode = key.split(":")
+            parsed[key] = (imdb_id, int(season), int(episode))
+        except ValueError:
+            results[key] = {"error": "Formato errato. Dovrebbe essere tt1234567:1:1", "status": 400}
+
+    @with_log_context
+    def safe(fn, *args):
+        try:
+            return fn(*args), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as executor:
+        # Risolvi ogni serie una sola volta
+        imdb_ids = list(dict.fromkeys(imdb_id for imdb_id, _, _ in parsed.values()))
+        resolved = {}
+        for imdb_id, (resolution, error) in zip(imdb_ids, executor.map(lambda imdb_id: safe(resolve_series, imdb_id), imdb_ids)):
+            if error:
+                # Un errore inatteso fa fallire solo le chiavi di questa serie
+                logging.error("Errore durante la risoluzione dell'IMDb ID %s: %s", imdb_id, error)
+                resolution = (None, ("Errore durante la risoluzione della serie", 500))
+            resolved[imdb_id] = resolution
+
+        # Carica ogni stagione necessaria una sola volta
+        season_keys = list(dict.fromkeys(
+            (resolved[imdb_id][0], season)
+            for imdb_id, season, _ in parsed.values()
+            if resolved[imdb_id][0]
+        ))
+        seasons = dict(zip(season_keys, executor.map(
+            lambda season_key: safe(load_season, *season_key),
+            season_keys,
+        )))
+
+        # Trova gli episodi e i relativi codici
+        episodes = {}
+        # Serie già verificate dopo un errore di stagione, per non ripetere la verifica per ogni chiave
+        checked = set()
+        for key, (imdb_id, season, episode) in parsed.items():
+            slug_for_load, error = resolved[imdb_id]
+            if error:
+                results[key] = {"error": error[0], "status": error[1]}
+                continue
+            season_episodes, season_error = seasons[(slug_for_load, season)]
+            if season_error:
+                logging.error("Errore durante il caricamento della stagione %s per slug '%s': %s", season, slug_for_load, season_error)
+                if imdb_id not in checked:
+                    checked.add(imdb_id)
+                    forget_stale_resolution(imdb_id, slug_for_load, season_error, title_page=False)
+                results[key] = {"error": "Dettagli della serie TV non trovati", "status": 404}
+                continue
+            episode_info, season_episodes = find_episode(slug_for_load, season, episode, season_episodes)
+            seasons[(slug_for_load, season)] = (season_episodes, None)
+            if not episode_info:
+                results[key] = {"error": f"Episodio {episode} della stagione {season} non trovato", "status": 404}
+                continue
+            combined_code, error = get_episode_code(episode_info.url)
+            if error:
+                results[key] = {"error": error[0], "status": error[1]}
+                continue
+            episodes[key] = (episode_info, combined_code)
+
+        # Ottieni i link di streaming in parallelo
+        links = executor.map(
+            lambda item: safe(flight.do, ('get_links', item[1]), sc.get_links, item[1]),
+            episodes.values(),
+        )
+        for (key, (episode_info, combined_code)), (link, error) in zip(episodes.items(), links):
+            if error or not link[1]:
+                logging.error("Errore durante l'ottenimento del link m3u8 per codice '%s': %s", combined_code, error)
+                results[key] = {"error": "Playlist M3U8 non trovata", "status": 404}
+            else:
+                results[key] = dict(episode_info.to_dict(), m3u8_playlist=link[1])
+
+    return jsonify({"results": {key: results[key] for key in keys}}), 200
+
 # Endpoint per caricare i dettagli del contenuto (rimane invariato)
 @app.route('/load', methods=['GET'])
 def load():
@@ -365,18 +1072,20 @@ def load():
         logging.warning("URL (slug) non fornito nella richiesta di /load.")
         return jsonify({"error": "URL non fornito"}), 400
 
-    logging.info(f"Inizio caricamento dei dettagli per slug: {slug}")
+    logging.info("Inizio caricamento dei dettagli per slug: %s", slug)
 
     try:
-        details = sc.load(slug)
-        logging.debug(f"Details loaded for slug '{slug}': {details}")
+        details = load_series(slug)
+        if isinstance(details, Series):
+            details = details.to_dict()
+        logging.debug("Details loaded for slug '%s': %s", slug, Summary(details))
         # Verifica che il tipo sia 'tv'
         if details.get('type', '').lower() != 'tv':
-            logging.error(f"Il contenuto caricato non è una serie TV: {details.get('type')}")
+            logging.error("Il contenuto caricato non è una serie TV: %s", details.get('type'))
             return jsonify({"error": "Il contenuto caricato non è una serie TV"}), 400
         return jsonify(details), 200
     except Exception as e:
-        logging.error(f"Errore durante il caricamento dei dettagli per slug '{slug}': {e}")
+        logging.error("Errore durante il caricamento dei dettagli per slug '%s': %s", slug, e)
         return jsonify({"error": str(e)}), 500
 
 # Endpoint per ottenere il link di streaming `m3u8` (rimane invariato)
@@ -387,17 +1096,17 @@ def get_links():
         logging.warning("Codice della serie TV non fornito nella richiesta di /get_links.")
         return jsonify({"error": "Codice della serie TV non fornito"}), 400
 
-    logging.info(f"Inizio ottenimento dei link per codice: {code}")
+    logging.info("Inizio ottenimento dei link per codice: %s", code)
 
     try:
-        iframe, m3u8_playlist = sc.get_links(code)
-        logging.debug(f"iframe: {iframe}, m3u8_playlist: {m3u8_playlist}")
+        iframe, m3u8_playlist = flight.do(('get_links', code), sc.get_links, code)
+        logging.debug("iframe: %s, m3u8_playlist: %s", iframe, m3u8_playlist)
         if not m3u8_playlist:
-            logging.error(f"m3u8_playlist non trovato per codice: {code}")
+            logging.error("m3u8_playlist non trovato per codice: %s", code)
             return jsonify({"error": "m3u8_playlist non trovato"}), 404
         return jsonify({"iframe": iframe, "m3u8_playlist": m3u8_playlist}), 200
     except Exception as e:
-        logging.error(f"Errore durante l'ottenimento dei link per codice '{code}': {e}")
+        logging.error("Errore durante l'ottenimento dei link per codice '%s': %s", code, e)
         return jsonify({"error": str(e)}), 500
 
 # Endpoint per ottenere tutte le stagioni e gli episodi di una serie TV tramite IMDb ID
@@ -408,62 +1117,43 @@ def get_seasons():
         logging.warning("IMDb ID non fornito nella richiesta.")
         return jsonify({"error": "IMDb ID non fornito"}), 400
 
-    logging.info(f"Inizio ricerca delle stagioni per IMDb ID: {imdb_id}")
+    logging.info("Inizio ricerca delle stagioni per IMDb ID: %s", imdb_id)
 
-    # Ottieni le informazioni del titolo da TMDb
-    title_info = get_title_from_imdb(imdb_id)
-    if not title_info:
-        logging.error(f"Titolo non trovato in TMDb per IMDb ID: {imdb_id}")
-        return jsonify({"error": "Titolo non trovato in TMDb"}), 404
-
-    logging.debug(f"Title Info: {title_info}")
-
-    try:
-        # Cerca su StreamingCommunity usando il titolo e l'anno
-        search_query = f"{title_info['title']} {title_info['year']}"
-        results = sc.search(search_query)
-        # Log solo i titoli dei risultati di ricerca
-        search_titles = [result.get('name', '') for result in results]
-        logging.debug(f"Risultati della ricerca per '{search_query}': {search_titles}")
-    except Exception as e:
-        logging.error(f"Errore durante la ricerca su StreamingCommunity: {e}")
-        return jsonify({"error": "Errore durante la ricerca su StreamingCommunity"}), 500
-
-    best_match = find_best_match(results, title_info)
-    if not best_match:
-        logging.error(f"Nessuna corrispondenza trovata su StreamingCommunity per IMDb ID: {imdb_id}")
-        return jsonify({"error": "Nessuna corrispondenza trovata"}), 404
-
-    logging.debug(f"Miglior corrispondenza trovata: {best_match.get('name')}")
-
-    # Estrarre il codice della serie TV e lo slug
-    film_code = best_match.get('id')
-    slug = best_match.get('slug', '')
-    slug_for_load = f"{film_code}-{slug}" if slug else str(film_code)
-    logging.debug(f"Slug for sc.load: {slug_for_load}")
+    slug_for_load, error = resolve_series(imdb_id)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
 
     # Carica i dettagli della serie TV usando sc.load con lo slug
     try:
-        sc_data = sc.load(slug_for_load)
-        logging.debug(f"Details loaded: {sc_data}")
+        sc_data = load_series(slug_for_load)
+        logging.debug("Details loaded: %s", Summary(sc_data))
     except Exception as e:
-        logging.error(f"Errore durante il caricamento dei dettagli per slug '{slug_for_load}': {e}")
+        logging.error("Errore durante il caricamento dei dettagli per slug '%s': %s", slug_for_load, e)
+        forget_stale_resolution(imdb_id, slug_for_load, e)
         return jsonify({"error": "Dettagli della serie TV non trovati"}), 404
 
-    # Estrarre tutte le stagioni disponibili
-    seasons = set(ep.get('season') for ep in sc_data.get('episodeList', []) if ep.get('season'))
-    episodes_per_season = {season: [] for season in seasons}
-    for ep in sc_data.get('episodeList', []):
-        if ep.get('season') and ep.get('episode'):
-            episodes_per_season[ep.get('season')].append(ep.get('episode'))
-
     response = {
         "name": sc_data.get('name'),
-        "seasons": {season: sorted(episodes) for season, episodes in episodes_per_season.items()}
+        "seasons": {
+            season: [number for number in numbers if number]
+            # I film non hanno stagioni: `load` restituisce un dizionario
+            for season, numbers in getattr(sc_data, 'seasons', {}).items()
+            if season
+        }
     }
 
     return jsonify(response), 200
 
+# Endpoint con le metriche nel formato testuale di Prometheus
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+# Endpoint con l'esito delle verifiche dei mirror e il dominio attivo
+@app.route('/mirrors', methods=['GET'])
+def mirrors():
+    return jsonify({"active": sc.domain, "mirrors": sc.mirror_status()}), 200
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     app.run(host='0.0.0.0', port=port)
@@ -0,0 +1,177 @@
+"""
+    Micro-benchmark offline per parsing e matching
+    Offline micro-benchmarks for parsing and matching
+
+Esegue ogni caso sulle pagine salvate in `benchmarks/fixtures`, senza rete, e
+riporta operazioni al secondo e memoria allocata per operazione.
+Runs every case against the pages saved in `benchmarks/fixtures`, with no
+network, and reports operations per second and memory allocated per operation.
+
+Uso / Usage:
+    python benchmarks/bench.py                      # tutti i casi / every case
+    python benchmarks/bench.py -k parse             # solo i casi che contengono "parse"
+    python benchmarks/bench.py --save base.json     # salva i risultati / save results
+    python benchmarks/bench.py --compare base.json  # confronta con un salvataggio / compare
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "libs", "scuapi"))
+
+# L'app crea i suoi archivi SQLite all'import: vanno in una cartella temporanea
+_TMP = tempfile.mkdtemp(prefix="scuapi-bench-")
+os.environ.setdefault("RESOLUTION_INDEX_PATH", os.path.join(_TMP, "resolution.sqlite3"))
+os.environ.setdefault("TRANSLATION_CACHE_PATH", os.path.join(_TMP, "translations.sqlite3"))
+os.environ.setdefault("CATALOG_PATH", os.path.join(_TMP, "catalog.sqlite3"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from scuapi import API  # noqa: E402
+import app  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FixtureSession:
+    """
+    Sessione che risponde con le fixture al posto della rete.
+    Session answering with the fixtures instead of the network.
+    """
+
+    def __init__(self):
+        self.pages = {
+            name: fixture(name)
+            for name in ("title.html", "season.html", "watch.html", "embed.html", "iframe.html", "search.json", "preview.json")
+        }
+
+    def get(self, url, **kwargs):
+        path = urlparse(url).path
+        if "/stagione-" in path:
+            return _Response(self.pages["season.html"])
+        if path.startswith("/titles/"):
+            return _Response(self.pages["title.html"])
+        if path.startswith("/watch/"):
+            return _Response(self.pages["watch.html"])
+        if path.startswith("/iframe/"):
+            return _Response(self.pages["embed.html"])
+        if path.startswith("/embed/"):
+            return _Response(self.pages["iframe.html"])
+        return _Response(self.pages["search.json"])
+
+    def post(self, url, **kwargs):
+        return _Response(self.pages["preview.json"])
+
+    def close(self):
+        pass
+
+
+def build_cases():
+    api = API("streamingcommunity.example", session=FixtureSession())
+    url = "https://streamingcommunity.example/titles/8813-il-trono-di-spade"
+    title_html = fixture("title.html")
+    season_html = fixture("season.html")
+    watch_html = fixture("watch.html")
+    embed_html = fixture("embed.html")
+    iframe_html = fixture("iframe.html")
+    preview = json.loads(fixture("preview.json"))
+    search_results = json.loads(fixture("search.json"))["data"]
+    for result in search_results:
+        result["url"] = f"{url.rsplit('/', 1)[0]}/{result['id']}-{result['slug']}"
+    title_info = json.loads(fixture("title_info.json"))
+    names = [result["name"] for result in search_results] + title_info["alternative_titles"]
+
+    return {
+        "parse_title_page": lambda: api._parse_title(url, api._parse_page_data(title_html), preview),
+        "parse_season_page": lambda: api._parse_season(api._parse_page_data(season_html), 1, 8813),
+        "parse_identity": lambda: api._parse_identity("8813-il-trono-di-spade", api._parse_page_data(title_html)),
+        "load_offline": lambda: api.load("8813-il-trono-di-spade"),
+        "load_offline_compact": lambda: api.load("8813-il-trono-di-spade", compact=True),
+        "links_watch_page": lambda: api._parse_embed_url(watch_html),
+        "links_embed_page": lambda: api._parse_iframe_url(embed_html),
+        "links_iframe_page": lambda: api._parse_playlist(iframe_html),
+        # Funzione senza lru_cache: con la cache dalla seconda ripetizione si misurerebbero solo gli hit
+        "normalize": lambda: [app.normalize.__wrapped__(name) for name in names],
+        "find_best_match_scoring": lambda: app.find_best_match(search_results, title_info),
+    }
+
+
+def measure(fn, min_time=0.5):
+    """
+    Restituisce operazioni al secondo e memoria (picco e totale allocato) per operazione.
+    Returns operations per second and memory (peak and total allocated) per operation.
+    """
+    fn()  # riscaldamento / warm-up
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    repeats = max(3, int(min_time / max(timer.timeit(number) / number, 1e-9) / number))
+    best = min(timer.repeat(repeat=min(repeats, 7), number=number)) / number
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+    return {"ops_per_sec": 1.0 / best, "peak_kib": peak / 1024, "allocated_kib": allocated / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", default="", help="esegue solo i casi che contengono questa stringa")
+    parser.add_argument("--save", help="salva i risultati in un file JSON")
+    parser.add_argument("--compare", help="confronta con un file JSON salvato in precedenza")
+    parser.add_argument("--min-time", type=float, default=0.5, help="secondi minimi di misura per caso")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'case':<26}{'ops/sec':>14}{'peak KiB':>12}{'alloc KiB':>12}{'vs base':>10}")
+    for name, fn in build_cases().items():
+        if args.keyword not in name:
+            continue
+        result = results[name] = measure(fn, args.min_time)
+        delta = ""
+        if name in baseline:
+            delta = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.1%}"
+        print(
+            f"{name:<26}{result['ops_per_sec']:>14,.1f}{result['peak_kib']:>12,.1f}"
+            f"{result['allocated_kib']:>12,.1f}{delta:>10}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-from .scuapi import API
\ No newline at end of file
+from .scuapi import API, Episode, LazyEpisodeList, Series, extract_data_page, make_session
+from .aio import AsyncAPI, make_async_client
+from .cache import TTLCache
+from .resilience import RetryPolicy
@@ -0,0 +1,423 @@
+"""
+    StreamingCommunity API for Python (asyncio)
+"""
+
+import asyncio
+import time
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - dipendenza opzionale
+    httpx = None
+
+from .scuapi import (
+    REQ_TIMEOUT,
+    SEASON_WORKERS,
+    LINKS_EXPIRY_MARGIN,
+    DEFAULT_USER_AGENT,
+    _BaseAPI,
+    SCAPIError,
+    WebPageTimeOutError,
+    WebPageStatusCodeError,
+    NoSeasonFoundError,
+    Series,
+    InvalidJSON,
+    PreviewError,
+)
+from .resilience import RETRY_STATUSES
+
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+
+def make_async_client(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+):
+    """
+    Crea un client HTTP asincrono condiviso con connessioni keep-alive.
+    Creates a shared asynchronous HTTP client with keep-alive connections.
+
+    Args:
+        max_connections (int):
+            Numero massimo di richieste contemporanee.
+            Maximum number of concurrent requests.
+        max_keepalive_connections (int):
+            Numero massimo di connessioni inattive mantenute aperte.
+            Maximum number of idle connections kept open.
+
+    Returns:
+        httpx.AsyncClient
+    """
+    if httpx is None:
+        raise ImportError(
+            "AsyncAPI richiede httpx: pip install httpx / AsyncAPI requires httpx: pip install httpx"
+        )
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        timeout=REQ_TIMEOUT,
+    )
+
+
+class AsyncAPI(_BaseAPI):
+    """
+    Versione asincrona di `API`, con gli stessi metodi e le stesse eccezioni.
+    Asynchronous counterpart of `API`, with the same methods and exceptions.
+
+    Tutte le richieste passano per un unico `httpx.AsyncClient`, quindi un solo
+    processo può mantenere centinaia di richieste in corso senza un thread per richiesta.
+    Every request goes through a single `httpx.AsyncClient`, so one process can
+    keep hundreds of requests in flight without a thread per request.
+
+    Args:
+        domain (str | list):
+            Il nome di dominio dell'API, oppure una lista di mirror (vedi `API`).
+            The domain name of the API, or a list of mirrors (see `API`).
+        user_agent (str, optional):
+            La stringa User-Agent da usare nelle intestazioni HTTP.
+            The User-Agent string to be used in HTTP headers.
+        client (httpx.AsyncClient, optional):
+            Client da condividere con altre istanze. Se omesso ne viene creato uno.
+            Client to share with other instances. Created if omitted.
+        season_workers (int, optional):
+            Numero massimo di pagine delle stagioni scaricate in parallelo da `load`.
+            Maximum number of season pages fetched concurrently by `load`.
+        links_cache (TTLCache, optional):
+            Vedi `API`.
+            See `API`.
+        links_expiry_margin (float, optional):
+            Vedi `API`.
+            See `API`.
+        observer (callable, optional):
+            Vedi `API`.
+            See `API`.
+        retry_policy, retry_policies, breaker_threshold, breaker_cooldown, stages_cache (optional):
+            Vedi `API`. Le richieste duplicate più lente vengono annullate.
+            See `API`. The slower of two hedged requests is cancelled.
+
+    Example:
+    ```
+    async with AsyncAPI("streamingcommunity.lu") as sc:
+        results = await sc.search("something")
+    ```
+    """
+
+    def __init__(
+        self,
+        domain,
+        user_agent=DEFAULT_USER_AGENT,
+        client=None,
+        season_workers=SEASON_WORKERS,
+        links_cache=None,
+        links_expiry_margin=LINKS_EXPIRY_MARGIN,
+        observer=None,
+        retry_policy=None,
+        retry_policies=None,
+        breaker_threshold=0,
+        breaker_cooldown=30.0,
+        stages_cache=None,
+    ):
+        super().__init__(
+            domain,
+            user_agent,
+            season_workers,
+            links_cache,
+            links_expiry_margin,
+            observer,
+            retry_policy,
+            retry_policies,
+            breaker_threshold,
+            breaker_cooldown,
+            stages_cache,
+        )
+        self._client = client or make_async_client()
+        self._probe_task = None
+
+    async def aclose(self):
+        """
+        Chiude il client HTTP e ferma la verifica dei mirror.
+        Closes the HTTP client and stops the mirror probing.
+        """
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+        await self._client.aclose()
+
+    async def _probe(self, domain):
+        url = f"https://{domain}{self.mirror_probe_path}"
+        start = time.perf_counter()
+        try:
+            response = await self._client.get(
+                url,
+                headers={"user-agent": self.user_agent},
+                timeout=REQ_TIMEOUT,
+                follow_redirects=False,
+            )
+        except httpx.HTTPError as e:
+            return self._probe_result(domain, start, error=e)
+        return self._probe_result(domain, start, status=response.status_code)
+
+    async def probe_mirrors(self):
+        """
+        Vedi `API.probe_mirrors`.
+        See `API.probe_mirrors`.
+        """
+        results = await asyncio.gather(*(self._probe(domain) for domain in self.domains))
+        return self._apply_probes(results)
+
+    def start_probing(self, interval):
+        """
+        Avvia nel loop corrente un task che chiama `probe_mirrors` ogni `interval` secondi, fino a `aclose`.
+        Starts a task in the running loop calling `probe_mirrors` every `interval` seconds, until `aclose`.
+        """
+
+        async def run():
+            while True:
+                try:
+                    await self.probe_mirrors()
+                except Exception:
+                    pass
+                await asyncio.sleep(interval)
+
+        self._probe_task = asyncio.ensure_future(run())
+        return self._probe_task
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _hedged(self, send, url, delay, **kwargs):
+        """
+        Vedi `API._hedged`; la richiesta più lenta viene annullata.
+        See `API._hedged`; the slower request is cancelled.
+        """
+        first = asyncio.ensure_future(send(url, **kwargs))
+        pending = {first}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+
+            self._count("_hedges")
+            pending.add(asyncio.ensure_future(send(url, **kwargs)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, method, url, kind, **kwargs):
+        """
+        Vedi `API._request`.
+        See `API._request`.
+        """
+        send = self._client.get if method == "GET" else self._client.post
+        policy = self._policy(kind)
+        breaker = self._breaker(url)
+        attempts = 1 + policy.retries if method == "GET" else 1
+
+        for attempt in range(attempts):
+            if attempt:
+                self._count("_retries")
+                await asyncio.sleep(policy.delay(attempt))
+            self._check_breaker(breaker, url)
+
+            delay = self._hedge_delay(kind, policy) if method == "GET" else None
+            start = time.perf_counter()
+            try:
+                if delay is None:
+                    response = await send(url, **kwargs)
+                else:
+                    response = await self._hedged(send, url, delay, **kwargs)
+            except httpx.TransportError:
+                self._record_outcome(breaker, False)
+                if attempt + 1 == attempts:
+                    raise
+                continue
+            except Exception:
+                self._record_outcome(breaker, False)
+                raise
+            except BaseException:
+                # Chiamata annullata (es. CancelledError): libera la prova senza contarla come errore
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            failed = response.status_code in RETRY_STATUSES
+            self._record_outcome(breaker, not failed)
+            if not failed:
+                self._latency(kind).add(time.perf_counter() - start)
+            if not failed or attempt + 1 == attempts:
+                return response
+
+    async def _wbpage_as_text(self, url, kind="title"):
+        try:
+            response = await self._request("GET", url, kind, timeout=REQ_TIMEOUT)
+        except httpx.TimeoutException as e:
+            raise WebPageTimeOutError(url) from e
+        if response.status_code == 200:
+            return response.text
+        else:
+            raise WebPageStatusCodeError(url, response.status_code)
+
+    async def _page_data(self, url, name="page data", kind="title"):
+        with self._observe(kind):
+            return self._parse_page_data(await self._wbpage_as_text(url, kind), name)
+
+    async def _season_episodes(self, url, season, sid=None, compact=False):
+        se_data = await self._page_data(f"{url}/stagione-{season}", kind="season")
+        return self._parse_season(se_data, season, sid, compact)
+
+    async def _load_seasons(self, url, seasons, compact=False):
+        semaphore = asyncio.Semaphore(self.season_workers)
+
+        async def fetch(se):
+            async with semaphore:
+                try:
+                    return await self._season_episodes(
+                        url, int(se["number"]), se["title_id"], compact
+                    )
+                except (SCAPIError, httpx.TransportError, ValueError, KeyError, TypeError):
+                    return None
+
+        results = await asyncio.gather(*(fetch(se) for se in seasons))
+
+        episode_list = []
+        failed_seasons = []
+        for se, episodes in zip(seasons, results):
+            if episodes is None:
+                failed_seasons.append(int(se["number"]))
+            else:
+                episode_list.extend(episodes)
+        return episode_list, failed_seasons
+
+    async def search(self, query):
+        """
+        Vedi `API.search`.
+        See `API.search`.
+        """
+        headers = {"user-agent": self.user_agent}
+        query_formatted = query.replace(" ", "%20")
+        url = f"{self._url.geturl()}/api/search?q={query_formatted}"
+
+        with self._observe("search"):
+            try:
+                document = await self._request("GET", url, "search", headers=headers, timeout=REQ_TIMEOUT)
+            except httpx.TimeoutException as e:
+                raise WebPageTimeOutError(query) from e
+
+            return self._parse_search(document, query)
+
+    async def preview(self, content_slug):
+        """
+        Vedi `API.preview`.
+        See `API.preview`.
+        """
+        headers = {"user-agent": self.user_agent}
+        content_id = content_slug.split("-")[0]
+        with self._observe("preview"):
+            try:
+                data = await self._request(
+                    "POST",
+                    self._url.geturl() + "/api/titles/preview/" + content_id,
+                    "preview",
+                    headers=headers,
+                    timeout=REQ_TIMEOUT,
+                )
+            except Exception as e:
+                raise PreviewError(content_slug, e) from e
+            try:
+                data_dict = data.json()
+            except Exception as e:
+                raise InvalidJSON(content_slug, e, data) from e
+            return data_dict
+
+    async def identity(self, content_slug):
+        """
+        Vedi `API.identity`.
+        See `API.identity`.
+        """
+        return self._parse_identity(
+            content_slug, await self._page_data(self._title_url(content_slug))
+        )
+
+    async def load_season(self, content_slug, season, compact=False):
+        """
+        Vedi `API.load_season`.
+        See `API.load_season`.
+        """
+        url = self._title_url(content_slug)
+        episode_list = await self._season_episodes(url, int(season), compact=compact)
+        if not episode_list:
+            raise NoSeasonFoundError(content_slug)
+        return Series({}, episode_list) if compact else episode_list
+
+    async def load(self, content_slug, compact=False):
+        """
+        Vedi `API.load`. La pagina del titolo e la preview vengono scaricate in parallelo.
+        See `API.load`. The title page and the preview are fetched concurrently.
+        """
+        url = self._title_url(content_slug)
+        data, preview_data = await asyncio.gather(
+            self._page_data(url), self.preview(content_slug)
+        )
+
+        details, seasons = self._parse_title(url, data, preview_data)
+
+        if seasons is not None:
+            episode_list, failed_seasons = await self._load_seasons(url, seasons, compact)
+
+            if not episode_list:
+                raise NoSeasonFoundError(details["name"])
+
+            details["failedSeasons"] = failed_seasons
+            if compact:
+                del details["episodeList"]
+                return Series(details, episode_list)
+            details["episodeList"] = episode_list
+
+        return details
+
+    async def get_links(self, content_id, episode_id=None):
+        """
+        Vedi `API.get_links`.
+        See `API.get_links`.
+        """
+        cached = self._cached_links(content_id, episode_id)
+        if cached is not None:
+            return cached
+
+        embed_url, iframe_url = self._cached_stages(content_id, episode_id)
+        if iframe_url is not None:
+            try:
+                return await self._links_chain(content_id, episode_id, embed_url, iframe_url)
+            except (SCAPIError, ValueError, KeyError):
+                self._drop_stages(content_id, episode_id)
+        return await self._links_chain(content_id, episode_id)
+
+    async def _links_chain(self, content_id, episode_id, embed_url=None, iframe_url=None):
+        if iframe_url is None:
+            with self._observe("watch"):
+                webpage = await self._wbpage_as_text(self._watch_url(content_id, episode_id), "watch")
+                embed_url = self._parse_embed_url(webpage)
+
+            with self._observe("embed"):
+                video_page_url = await self._wbpage_as_text(embed_url, "embed")
+                iframe_url = self._parse_iframe_url(video_page_url)
+
+        with self._observe("vixcloud"):
+            iframe_page = await self._wbpage_as_text(iframe_url, "vixcloud")
+            dl_url = self._parse_playlist(iframe_page)
+        self._store_stages(content_id, episode_id, embed_url, iframe_url)
+        self._store_links(content_id, episode_id, iframe_url, dl_url)
+        return iframe_url, dl_url
@@ -0,0 +1,112 @@
+"""
+    Cache in memoria con scadenza (TTL) ed eviction LRU
+    In-memory cache with expiry (TTL) and LRU eviction
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache limitata e thread-safe: ogni voce scade dopo `ttl` secondi e, superata
+    la dimensione massima, viene rimossa la voce usata meno di recente.
+    Bounded, thread-safe cache: each entry expires after `ttl` seconds and, once
+    the maximum size is exceeded, the least recently used entry is evicted.
+
+    Attributes:
+        hits (int):
+            Numero di letture andate a buon fine.
+            Number of successful lookups.
+        misses (int):
+            Numero di letture senza risultato (voce assente o scaduta).
+            Number of failed lookups (missing or expired entry).
+
+    Args:
+        maxsize (int):
+            Numero massimo di voci.
+            Maximum number of entries.
+        ttl (float):
+            Durata predefinita di una voce, in secondi.
+            Default lifetime of an entry, in seconds.
+
+    Example:
+    ```
+    cache = TTLCache(maxsize=1024, ttl=3600)
+    cache.set("tt0903747", data)
+    data = cache.get("tt0903747")
+    ```
+    """
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Restituisce il valore associato a `key`, oppure `default` se assente o scaduto.
+        Returns the value stored for `key`, or `default` if missing or expired.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Salva un valore; `ttl` sostituisce la durata predefinita per questa voce.
+        Stores a value; `ttl` overrides the default lifetime for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Rimuove una voce, oppure tutte se `key` è None.
+        Removes an entry, or every entry if `key` is None.
+        """
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self):
+        """
+        Restituisce dimensione e contatori della cache.
+        Returns the cache size and counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,160 @@
+"""
+    Metriche in memoria esportate nel formato testuale di Prometheus
+    In-memory metrics exported in the Prometheus text format
+"""
+
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    """
+    Contatore monotono con etichette.
+    Monotonic counter with labels.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """
+    Istogramma cumulativo con etichette (bucket, somma e conteggio).
+    Cumulative histogram with labels (buckets, sum and count).
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            values = {labels: (list(b), s, c) for labels, (b, s, c) in self._values.items()}
+        for labels, (bucket_counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                yield (
+                    self.name + "_bucket",
+                    _format_labels(self.labelnames, labels, [("le", repr(float(bound)))]),
+                    cumulative,
+                )
+            yield (
+                self.name + "_bucket",
+                _format_labels(self.labelnames, labels, [("le", "+Inf")]),
+                count,
+            )
+            yield self.name + "_sum", _format_labels(self.labelnames, labels), total
+            yield self.name + "_count", _format_labels(self.labelnames, labels), count
+
+
+class Gauge:
+    """
+    Valore istantaneo letto da una funzione al momento dell'esportazione.
+    Instantaneous value read from a function at export time.
+
+    La funzione restituisce un dizionario {tupla di etichette: valore}.
+    The function returns a {label tuple: value} dict.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+
+    def samples(self):
+        for labels, value in sorted(self.callback().items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Registry:
+    """
+    Raccolta di metriche esportabile con `render()`.
+    Collection of metrics exportable through `render()`.
+
+    Example:
+    ```
+    registry = Registry()
+    requests_total = registry.counter("requests_total", "Richieste", ["route"])
+    requests_total.inc("/load")
+    text = registry.render()
+    ```
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        return self._register(Gauge(name, documentation, labelnames, callback))
+
+    def render(self):
+        """
+        Restituisce tutte le metriche nel formato testuale di Prometheus.
+        Returns every metric in the Prometheus text format.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
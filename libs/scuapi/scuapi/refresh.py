@@ -0,0 +1,268 @@
+"""
+    Cache "stale-while-revalidate" con aggiornamento in background delle voci più richieste
+    Stale-while-revalidate cache with background refresh of the most requested entries
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .singleflight import SingleFlight
+
+
+class RefreshBudget:
+    """
+    Limite di aggiornamenti in background verso una chiamata esterna (token bucket).
+    Limit of background refreshes towards an upstream call (token bucket).
+
+    Args:
+        rate (float):
+            Aggiornamenti consentiti ogni `per` secondi.
+            Refreshes allowed every `per` seconds.
+        per (float, optional):
+            Finestra in secondi.
+            Window in seconds.
+    """
+
+    def __init__(self, rate, per=60.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """
+        Consuma un aggiornamento se disponibile.
+        Consumes one refresh if available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate, self._tokens + (now - self._updated) * self.rate / self.per
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until", "hits", "loader", "upstream", "refreshing")
+
+    def __init__(self, value, fresh_until, stale_until, loader, upstream):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.hits = 0
+        self.loader = loader
+        self.upstream = upstream
+        self.refreshing = False
+
+
+class RefreshScheduler:
+    """
+    Cache che restituisce l'ultima copia valida anche dopo la scadenza e la aggiorna in background.
+    Cache returning the last good copy even after expiry and refreshing it in the background.
+
+    - Entro `ttl` la voce è fresca e viene restituita così com'è.
+    - Scaduto `ttl` ma entro `max_stale`, viene restituita la copia esistente e ne parte l'aggiornamento.
+    - Oltre `max_stale` (o al primo accesso) il caricamento avviene nella richiesta.
+    - Le voci richieste almeno `hot_hits` volte dall'ultimo caricamento sono "calde" e vengono
+      aggiornate `refresh_ahead` secondi prima della scadenza, così nessuna richiesta le trova scadute.
+    - Within `ttl` the entry is fresh and returned as is.
+    - Past `ttl` but within `max_stale`, the existing copy is returned and a refresh starts.
+    - Past `max_stale` (or on first access) loading happens on the request path.
+    - Entries requested at least `hot_hits` times since their last load are "hot" and get
+      refreshed `refresh_ahead` seconds before expiry, so no request finds them expired.
+
+    Gli aggiornamenti in background rispettano un `RefreshBudget` per chiamata esterna; se il
+    budget è esaurito la copia esistente resta in uso e l'aggiornamento viene ritentato più tardi.
+    Background refreshes honour a `RefreshBudget` per upstream; when the budget is exhausted the
+    existing copy stays in use and the refresh is retried later.
+
+    Args:
+        ttl (float, optional):
+            Durata di una copia fresca, in secondi.
+            Lifetime of a fresh copy, in seconds.
+        max_stale (float, optional):
+            Per quanto tempo dopo `ttl` una copia può ancora essere restituita.
+            How long after `ttl` a copy may still be returned.
+        maxsize (int, optional):
+            Numero massimo di voci; oltre viene rimossa quella usata meno di recente.
+            Maximum number of entries; beyond it the least recently used one is evicted.
+        hot_hits (int, optional):
+            Accessi dall'ultimo caricamento oltre cui una voce è calda.
+            Accesses since the last load beyond which an entry is hot.
+        refresh_ahead (float, optional):
+            Anticipo sulla scadenza con cui aggiornare le voci calde, in secondi.
+            How early before expiry hot entries are refreshed, in seconds.
+        budgets (dict, optional):
+            {upstream: RefreshBudget}; gli upstream senza budget non hanno limiti.
+            {upstream: RefreshBudget}; upstreams without a budget are unlimited.
+        workers (int, optional):
+            Thread dedicati agli aggiornamenti.
+            Threads dedicated to refreshes.
+        interval (float, optional):
+            Ogni quanti secondi cercare le voci calde da aggiornare; 0 disattiva il controllo periodico.
+            How often, in seconds, to look for hot entries to refresh; 0 disables the periodic check.
+
+    Example:
+    ```
+    scheduler = RefreshScheduler(ttl=3600, budgets={"load": RefreshBudget(30)})
+    details = scheduler.get(("load", slug), sc.load, slug, upstream="load")
+    ```
+    """
+
+    def __init__(
+        self,
+        ttl=3600,
+        max_stale=24 * 3600,
+        maxsize=512,
+        hot_hits=2,
+        refresh_ahead=300,
+        budgets=None,
+        workers=2,
+        interval=30,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.maxsize = maxsize
+        self.hot_hits = hot_hits
+        self.refresh_ahead = refresh_ahead
+        self.budgets = dict(budgets or {})
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.budget_skips = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scuapi-refresh")
+        self._stopped = threading.Event()
+        if interval > 0:
+            threading.Thread(
+                target=self._run, args=(interval,), name="scuapi-refresh-scheduler", daemon=True
+            ).start()
+
+    def get(self, key, fn, *args, upstream=None, **kwargs):
+        """
+        Restituisce il valore di `key`, caricandolo con `fn(*args, **kwargs)` se assente o troppo vecchio.
+        Returns the value for `key`, loading it with `fn(*args, **kwargs)` if missing or too old.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stale_until > now:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                if entry.fresh_until > now:
+                    self.hits += 1
+                    return entry.value
+                self.stale_served += 1
+                self._schedule(key, entry)
+                return entry.value
+            self.misses += 1
+
+        return self._flight.do(key, self._load, key, lambda: fn(*args, **kwargs), upstream)
+
+    def _load(self, key, loader, upstream):
+        value = loader()
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(
+                value, now + self.ttl, now + self.ttl + self.max_stale, loader, upstream
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def _schedule(self, key, entry):
+        # Chiamato con self._lock acquisito
+        if entry.refreshing:
+            return
+        budget = self.budgets.get(entry.upstream)
+        if budget is not None and not budget.take():
+            self.budget_skips += 1
+            return
+        entry.refreshing = True
+        self._executor.submit(self._refresh, key, entry)
+
+    def _refresh(self, key, entry):
+        try:
+            self._flight.do(key, self._load, key, entry.loader, entry.upstream)
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            # La copia esistente resta valida fino a `stale_until`
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            entry.refreshing = False
+
+    def refresh_hot(self):
+        """
+        Avvia l'aggiornamento delle voci calde vicine alla scadenza.
+        Starts refreshing the hot entries close to expiry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry.stale_until <= now:
+                    del self._entries[key]
+                elif entry.hits >= self.hot_hits and entry.fresh_until - self.refresh_ahead <= now:
+                    self._schedule(key, entry)
+
+    def _run(self, interval):
+        while not self._stopped.wait(interval):
+            self.refresh_hot()
+
+    def invalidate(self, key=None):
+        """
+        Rimuove una voce, oppure tutte se `key` è None.
+        Removes an entry, or every entry if `key` is None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def close(self):
+        """
+        Ferma il controllo periodico e i thread di aggiornamento.
+        Stops the periodic check and the refresh threads.
+        """
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        """
+        Restituisce dimensione e contatori, nello stesso formato di `TTLCache.stats` più i contatori degli aggiornamenti.
+        Returns size and counters, in the same format as `TTLCache.stats` plus the refresh counters.
+        """
+        now = time.monotonic()
+        with self._lock:
+            lookups = self.hits + self.stale_served + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits + self.stale_served,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.stale_served) / lookups if lookups else 0.0,
+                "hot": sum(1 for entry in self._entries.values() if entry.hits >= self.hot_hits),
+                "stale": sum(1 for entry in self._entries.values() if entry.fresh_until <= now),
+                "stale_served": self.stale_served,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "budget_skips": self.budget_skips,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,156 @@
+"""
+    Politiche di ripetizione, richieste "hedged" e circuit breaker per le chiamate esterne
+    Retry, hedged-request and circuit-breaker policies for upstream calls
+"""
+
+import random
+import threading
+import time
+from collections import deque
+
+# Codici di stato per cui una GET viene ripetuta e contata come errore dell'host
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """
+    Politica di una chiamata esterna: ripetizioni con backoff esponenziale e jitter,
+    e richiesta "hedged" opzionale.
+    Policy for an upstream call: retries with exponential backoff and jitter, and an
+    optional hedged request.
+
+    Solo le GET vengono ripetute o duplicate; le POST fanno sempre un solo tentativo.
+    Only GETs are retried or hedged; POSTs always make a single attempt.
+
+    Args:
+        retries (int, optional):
+            Tentativi aggiuntivi dopo il primo, su timeout, errori di connessione e `RETRY_STATUSES`.
+            Extra attempts after the first one, on timeouts, connection errors and `RETRY_STATUSES`.
+        backoff (float, optional):
+            Attesa base in secondi, raddoppiata a ogni tentativo.
+            Base wait in seconds, doubled on every attempt.
+        max_backoff (float, optional):
+            Attesa massima in secondi.
+            Maximum wait in seconds.
+        hedge_percentile (float, optional):
+            Se impostato, una seconda richiesta identica parte quando la prima supera questo
+            percentile delle latenze recenti; vince la prima risposta.
+            If set, a second identical request starts when the first one exceeds this
+            percentile of the recent latencies; the first response wins.
+        hedge_min_samples (int, optional):
+            Latenze da raccogliere prima di iniziare a duplicare le richieste.
+            Latencies to collect before starting to hedge requests.
+
+    Example:
+    ```
+    sc = API("streamingcommunity.lu", retry_policies={"vixcloud": RetryPolicy(retries=2, hedge_percentile=95)})
+    ```
+    """
+
+    def __init__(
+        self,
+        retries=0,
+        backoff=0.2,
+        max_backoff=2.0,
+        hedge_percentile=None,
+        hedge_min_samples=20,
+    ):
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+    def delay(self, attempt):
+        """
+        Attesa prima del tentativo `attempt` (da 1), con "full jitter".
+        Wait before attempt number `attempt` (from 1), with full jitter.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+
+class LatencyTracker:
+    """
+    Finestra scorrevole delle latenze recenti di una chiamata esterna.
+    Sliding window of the recent latencies of an upstream call.
+    """
+
+    def __init__(self, window=256):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile, min_samples=1):
+        """
+        Restituisce il percentile richiesto, oppure None se i campioni sono meno di `min_samples`.
+        Returns the requested percentile, or None with fewer than `min_samples` samples.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker per host: dopo `threshold` errori consecutivi rifiuta le chiamate
+    per `cooldown` secondi, poi lascia passare una sola chiamata di prova.
+    Per-host circuit breaker: after `threshold` consecutive failures it rejects calls
+    for `cooldown` seconds, then lets a single trial call through.
+    """
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return "open"
+            return "half_open"
+
+    def allow(self):
+        """
+        Indica se una chiamata può partire.
+        Tells whether a call may go out.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def release(self):
+        """
+        Libera la chiamata di prova senza registrarne l'esito (es. se è stata annullata).
+        Releases the trial call without recording its outcome (e.g. when it was cancelled).
+        """
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
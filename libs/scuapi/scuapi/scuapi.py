@@ -8,10 +8,98 @@
 import json
 import re
 import html
-from urllib.parse import urlparse
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse, parse_qs
 import requests
+from requests.adapters import HTTPAdapter
+
+from .resilience import RETRY_STATUSES, CircuitBreaker, LatencyTracker, RetryPolicy
 
 REQ_TIMEOUT = 5
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+SEASON_WORKERS = 4
+# Secondi di anticipo con cui scade in cache un link rispetto al suo token
+LINKS_EXPIRY_MARGIN = 120
+# Percorso richiesto per verificare un mirror e rapporto di latenza sotto cui si passa a un mirror più veloce
+MIRROR_PROBE_PATH = "/"
+MIRROR_SWITCH_RATIO = 0.8
+
+_DATA_PAGE_ATTR = 'data-page="'
+_TRAILING_COMMA_RE = re.compile(r',[^"]+}')
+_IFRAME_SRC_RE = re.compile(r'<iframe[^>]+src\s*=\s*"([^"]+)')
+_PLAYLIST_PARAMS_RE = re.compile(r"window\.masterPlaylist[^:]+params:[^{]+({[^<]+?})")
+_PLAYLIST_URL_RE = re.compile(r"window\.masterPlaylist[^<]+url:[^<]+\'([^<]+?)\'")
+_QUERY_RE = re.compile(r"\?[^#]+")
+
+
+def extract_data_page(webpage, name="page data"):
+    """
+    Estrae il valore dell'attributo `data-page`, decodificando le entità HTML solo in quella porzione.
+    Extracts the `data-page` attribute value, unescaping HTML entities in that slice only.
+
+    Il valore è codificato come attributo HTML e non può contenere virgolette doppie,
+    quindi termina alla prima `"` dopo l'apertura.
+    The value is encoded as an HTML attribute and cannot contain double quotes,
+    so it ends at the first `"` after the opening one.
+
+    Args:
+        webpage (str):
+            L'HTML della pagina, non decodificato.
+            The page HTML, not unescaped.
+        name (str, optional):
+            Nome usato nell'eccezione se l'attributo manca.
+            Name used in the exception if the attribute is missing.
+
+    Returns:
+        str:
+            Il JSON contenuto nell'attributo.
+            The JSON held by the attribute.
+    """
+    start = webpage.find(_DATA_PAGE_ATTR)
+    if start == -1:
+        raise MatchNotFound(name)
+    start += len(_DATA_PAGE_ATTR)
+    end = webpage.find('"', start)
+    if end == -1:
+        raise MatchNotFound(name)
+    return html.unescape(webpage[start:end])
+
+
+def make_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Crea una sessione HTTP con un pool di connessioni persistenti (keep-alive).
+    Creates an HTTP session backed by a pool of persistent (keep-alive) connections.
+
+    Le connessioni verso lo stesso host vengono riutilizzate, evitando un nuovo
+    handshake TCP+TLS (e la risoluzione DNS) a ogni richiesta.
+    Connections to the same host are reused, avoiding a new TCP+TLS handshake
+    (and DNS lookup) on every request.
+
+    Args:
+        pool_connections (int):
+            Numero di host distinti da tenere in cache.
+            Number of distinct hosts to keep pools for.
+        pool_maxsize (int):
+            Numero massimo di connessioni mantenute per host.
+            Maximum number of connections kept per host.
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 class SCAPIError(Exception):
@@ -33,6 +121,7 @@ class WebPageStatusCodeError(SCAPIError):
     """Raised when status code not 200"""
 
     def __init__(self, url, status_code):
+        self.status_code = status_code
         self.message = f"""
             '{url}' ha restituito {status_code} http error code.
             '{url}' returned {status_code} http error code.
@@ -87,49 +176,505 @@ class PreviewError(SCAPIError):
         super().__init__(self.message)
 
 
-class API:
+class CircuitOpenError(SCAPIError):
+    """Raised when the circuit breaker of a host is open"""
+
+    def __init__(self, host):
+        self.host = host
+        self.message = f"""
+            '{host}' è temporaneamente escluso dopo errori ripetuti.
+            '{host}' is temporarily skipped after repeated failures.
+            """
+        super().__init__(self.message)
+
+
+class LazyEpisodeList(Sequence):
     """
-    Una classe che interagisce con l'API di StreamingCommunity, gestendo le operazioni di ricerca e recupero dei dati.
-    A class to interact with the StreamingCommunity API, handling search and data retrieval operations.
+    Lista di episodi che scarica le pagine delle stagioni solo quando servono.
+    Episode list that fetches season pages only when they are accessed.
+
+    `season(n)` e `episode(n, e)` scaricano una sola stagione; l'accesso come
+    sequenza (indice, iterazione, len) scarica tutte le stagioni mancanti.
+    `season(n)` and `episode(n, e)` fetch a single season; sequence access
+    (indexing, iteration, len) fetches every missing season.
 
     Attributes:
-        user_agent (str):
-            La stringa User-Agent da usare nelle intestazioni HTTP per le richieste.
-            The User-Agent string to be used in HTTP headers for requests.
-        domain (str):
-            Il nome di dominio dell'API.
-            The domain name of the API.
-        _url (str):
-            L'URL completo costruito dal nome di dominio per effettuare le richieste API.
-            The full URL constructed from the domain name for making API requests.
+        seasons (list):
+            I numeri delle stagioni disponibili.
+            The available season numbers.
+        failed_seasons (list):
+            Le stagioni che non è stato possibile scaricare.
+            The seasons that could not be fetched.
+    """
 
-    Args:
-        domain (str):
-            Il nome di dominio dell'API.
-            The domain name of the API.
-        user_agent (str, optional):
-            La stringa User-Agent da usare nelle intestazioni HTTP. Per impostazione predefinita, è una stringa User-Agent Edge browser in esecuzione su Windows 7.
-            The User-Agent string to be used in HTTP headers. Defaults to a standard User-Agent Edge browser running on Windows 7.
+    def __init__(self, api, url, seasons):
+        self._api = api
+        self._url = url
+        self._seasons = seasons
+        self._loaded = {}
+        self._lock = threading.Lock()
+        # Un lock per stagione: gli scaricamenti avvengono fuori da `_lock`
+        self._season_locks = {}
+        self.seasons = [int(se["number"]) for se in seasons]
+        self.failed_seasons = []
+
+    def season(self, number):
+        """
+        Restituisce gli episodi di una stagione, scaricandola se necessario.
+        Returns the episodes of a season, fetching it if needed.
+
+        Se lo scaricamento fallisce la stagione finisce in `failed_seasons` e viene restituita una lista vuota.
+        If the fetch fails the season is added to `failed_seasons` and an empty list is returned.
+        """
+        number = int(number)
+        with self._lock:
+            if number in self._loaded:
+                return self._loaded[number]
+            se = next((se for se in self._seasons if int(se["number"]) == number), None)
+            if se is None:
+                return []
+            season_lock = self._season_locks.setdefault(number, threading.Lock())
+
+        with season_lock:
+            with self._lock:
+                if number in self._loaded:
+                    return self._loaded[number]
+            episodes, failed = self._api._load_seasons(self._url, [se])
+            with self._lock:
+                if failed:
+                    if number not in self.failed_seasons:
+                        self.failed_seasons.append(number)
+                    return []
+                if number in self.failed_seasons:
+                    self.failed_seasons.remove(number)
+                self._loaded[number] = episodes
+                return episodes
+
+    def episode(self, season, episode):
+        """
+        Restituisce un singolo episodio o None.
+        Returns a single episode or None.
+        """
+        episode = int(episode)
+        return next((ep for ep in self.season(season) if ep["episode"] == episode), None)
+
+    def _all(self):
+        with self._lock:
+            missing = [
+                se
+                for se in self._seasons
+                if int(se["number"]) not in self._loaded
+                and int(se["number"]) not in self.failed_seasons
+            ]
+        if missing:
+            episodes, failed = self._api._load_seasons(self._url, missing)
+        with self._lock:
+            if missing:
+                self.failed_seasons.extend(
+                    number for number in failed if number not in self.failed_seasons
+                )
+                for se in missing:
+                    number = int(se["number"])
+                    if number not in failed:
+                        self._loaded.setdefault(
+                            number, [ep for ep in episodes if ep["season"] == number]
+                        )
+            return [
+                ep
+                for number in self.seasons
+                for ep in self._loaded.get(number, [])
+            ]
+
+    def __getitem__(self, index):
+        return self._all()[index]
+
+    def __len__(self):
+        return len(self._all())
+
+    def __iter__(self):
+        return iter(self._all())
+
+
+class Episode:
+    """
+    Episodio compatto: attributi in slot e URL calcolato solo quando serve.
+    Compact episode: slotted attributes and a URL built only when needed.
+    """
+
+    __slots__ = (
+        "name",
+        "season",
+        "episode",
+        "description",
+        "duration",
+        "images",
+        "scws_id",
+        "episode_id",
+        "title_id",
+        "_base_url",
+    )
+
+    def __init__(
+        self,
+        name,
+        season,
+        episode,
+        description,
+        duration,
+        images,
+        scws_id,
+        episode_id,
+        title_id,
+        base_url,
+    ):
+        self.name = name
+        self.season = season
+        self.episode = episode
+        self.description = description
+        self.duration = duration
+        self.images = images
+        self.scws_id = scws_id
+        self.episode_id = episode_id
+        self.title_id = title_id
+        self._base_url = base_url
+
+    @property
+    def url(self):
+        return f"{self._base_url}/watch/{self.title_id}?e={self.episode_id}"
+
+    def to_dict(self):
+        """
+        Restituisce l'episodio nello stesso formato di `episodeList` di `load`.
+        Returns the episode in the same format as `load`'s `episodeList`.
+        """
+        return {
+            "name": self.name,
+            "season": self.season,
+            "episode": self.episode,
+            "description": self.description,
+            "duration": self.duration,
+            "images": self.images,
+            "url": self.url,
+            "scws_id": self.scws_id,
+        }
+
+    def __repr__(self):
+        return f"Episode(season={self.season}, episode={self.episode}, name={self.name!r})"
+
+
+class Series:
+    """
+    Serie compatta restituita da `load(..., compact=True)`.
+    Compact series returned by `load(..., compact=True)`.
+
+    Attributes:
+        info (dict):
+            I dati della serie, come in `load` ma senza `episodeList`.
+            The series data, as in `load` but without `episodeList`.
+        episode_list (list):
+            Tutti gli episodi, nell'ordine di caricamento.
+            Every episode, in load order.
+        episodes (dict):
+            Indice {(stagione, episodio): Episode}.
+            {(season, episode): Episode} index.
+        seasons (dict):
+            Mappa {stagione: [numeri degli episodi ordinati]}.
+            {season: [sorted episode numbers]} map.
+
+    Se più episodi hanno la stessa coppia (stagione, episodio) l'indice tiene il primo, come una ricerca
+    lineare in `episodeList`; `episode_list`, `seasons`, `season()` e `to_dict()` li conservano tutti.
+    If several episodes share the same (season, episode) pair the index keeps the first one, like a linear
+    search in `episodeList`; `episode_list`, `seasons`, `season()` and `to_dict()` keep all of them.
+    """
+
+    __slots__ = ("info", "episode_list", "episodes", "seasons", "_by_season")
+
+    def __init__(self, info, episode_list):
+        self.info = info
+        self.episode_list = list(episode_list)
+        self.episodes = {}
+        by_season = {}
+        for ep in self.episode_list:
+            self.episodes.setdefault((ep.season, ep.episode), ep)
+            by_season.setdefault(ep.season, []).append(ep)
+        self._by_season = {
+            season: sorted(episodes, key=lambda ep: ep.episode)
+            for season, episodes in sorted(by_season.items())
+        }
+        self.seasons = {
+            season: [ep.episode for ep in episodes] for season, episodes in self._by_season.items()
+        }
+
+    def episode(self, season, episode):
+        """
+        Restituisce un episodio in O(1), oppure None.
+        Returns an episode in O(1), or None.
+        """
+        return self.episodes.get((int(season), int(episode)))
+
+    def season(self, season):
+        """
+        Restituisce gli episodi di una stagione, in ordine.
+        Returns the episodes of a season, in order.
+        """
+        return list(self._by_season.get(int(season), []))
+
+    def __getitem__(self, key):
+        return self.info[key]
+
+    def get(self, key, default=None):
+        return self.info.get(key, default)
+
+    def to_dict(self):
+        """
+        Restituisce la serie nello stesso formato di `load`.
+        Returns the series in the same format as `load`.
+        """
+        details = dict(self.info)
+        details["episodeList"] = [ep.to_dict() for ep in self.episode_list]
+        return details
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 11.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36"
+
+
+class _BaseAPI:
+    """
+    Logica di parsing condivisa tra `API` e `AsyncAPI`, senza alcuna operazione di rete.
+    Parsing logic shared by `API` and `AsyncAPI`, free of any network I/O.
     """
 
     def __init__(
         self,
         domain,
-        user_agent="Mozilla/5.0 (Windows NT 11.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
+        user_agent=DEFAULT_USER_AGENT,
+        season_workers=SEASON_WORKERS,
+        links_cache=None,
+        links_expiry_margin=LINKS_EXPIRY_MARGIN,
+        observer=None,
+        retry_policy=None,
+        retry_policies=None,
+        breaker_threshold=0,
+        breaker_cooldown=30.0,
+        stages_cache=None,
     ):
         self.user_agent = user_agent
+        self.domains = [domain] if isinstance(domain, str) else list(domain)
+        if not self.domains:
+            raise ValueError("Serve almeno un dominio / At least one domain is required")
+        self._set_domain(self.domains[0])
+        self.mirror_probe_path = MIRROR_PROBE_PATH
+        self.mirror_switch_ratio = MIRROR_SWITCH_RATIO
+        self._mirrors = dict.fromkeys(self.domains)
+        self._mirror_lock = threading.Lock()
+        self.season_workers = max(1, season_workers)
+        self.links_cache = links_cache
+        self.links_expiry_margin = links_expiry_margin
+        self.stages_cache = stages_cache
+        self.observer = observer
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_policies = dict(retry_policies or {})
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._breakers = {}
+        self._latencies = {}
+        self._resilience_lock = threading.Lock()
+        self._retries = 0
+        self._hedges = 0
+
+    @contextmanager
+    def _observe(self, kind):
+        """
+        Misura un passaggio verso l'esterno e lo notifica a `observer(kind, secondi, errore)`.
+        Times an upstream hop and reports it to `observer(kind, seconds, error)`.
+        """
+        if self.observer is None:
+            yield
+            return
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.observer(kind, time.perf_counter() - start, error)
+
+    def _set_domain(self, domain):
         self.domain = domain
-        self._url = urlparse("https://" + self.domain)
+        self._url = urlparse("https://" + domain)
+
+    def _probe_result(self, domain, start, status=None, error=None):
+        latency = time.perf_counter() - start
+        if error is None and status != 200:
+            error = f"HTTP {status}"
+        return {
+            "domain": domain,
+            "ok": error is None,
+            "latency": latency,
+            "status": status,
+            "error": None if error is None else str(error),
+            "checked_at": time.time(),
+        }
+
+    def _apply_probes(self, results):
+        """
+        Registra i risultati delle verifiche e passa al mirror sano più veloce se quello
+        attivo non risponde o è più lento di `mirror_switch_ratio`.
+        Stores the probe results and switches to the fastest healthy mirror if the
+        active one is down or slower by more than `mirror_switch_ratio`.
+        """
+        with self._mirror_lock:
+            for result in results:
+                self._mirrors[result["domain"]] = result
+            healthy = [result for result in self._mirrors.values() if result and result["ok"]]
+            if not healthy:
+                return self.domain
+            best = min(healthy, key=lambda result: result["latency"])
+            current = self._mirrors.get(self.domain)
+            if (
+                current is None
+                or not current["ok"]
+                or best["latency"] < current["latency"] * self.mirror_switch_ratio
+            ):
+                self._set_domain(best["domain"])
+            return self.domain
+
+    def mirror_status(self):
+        """
+        Restituisce l'ultima verifica di ogni dominio e quale è attivo.
+        Returns the last probe of every domain and which one is active.
+
+        Returns:
+            list:
+                [{domain, active, ok, latency, status, error, checked_at}]; i campi della
+                verifica sono None se il dominio non è ancora stato verificato.
+                [{domain, active, ok, latency, status, error, checked_at}]; the probe
+                fields are None if the domain has not been probed yet.
+        """
+        with self._mirror_lock:
+            mirrors = dict(self._mirrors)
+            active = self.domain
+        status = []
+        for domain, result in mirrors.items():
+            entry = dict.fromkeys(("ok", "latency", "status", "error", "checked_at"))
+            entry.update(result or {})
+            entry.update(domain=domain, active=domain == active)
+            status.append(entry)
+        return status
+
+    def _policy(self, kind):
+        return self.retry_policies.get(kind, self.retry_policy)
+
+    def _breaker(self, url):
+        """
+        Restituisce il circuit breaker dell'host di `url`, oppure None se disattivati.
+        Returns the circuit breaker for the host of `url`, or None when disabled.
+        """
+        if not self.breaker_threshold:
+            return None
+        host = urlparse(url).netloc
+        with self._resilience_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_cooldown
+                )
+        return breaker
+
+    def _check_breaker(self, breaker, url):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(urlparse(url).netloc)
+
+    def _record_outcome(self, breaker, ok):
+        if breaker is not None:
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def _latency(self, kind):
+        with self._resilience_lock:
+            tracker = self._latencies.get(kind)
+            if tracker is None:
+                tracker = self._latencies[kind] = LatencyTracker()
+        return tracker
+
+    def _hedge_delay(self, kind, policy):
+        """
+        Secondi dopo cui duplicare una GET, oppure None se la richiesta non va duplicata.
+        Seconds after which a GET is hedged, or None if it should not be.
+        """
+        if policy.hedge_percentile is None:
+            return None
+        return self._latency(kind).percentile(
+            policy.hedge_percentile, policy.hedge_min_samples
+        )
+
+    def _count(self, counter):
+        with self._resilience_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def upstream_stats(self):
+        """
+        Restituisce lo stato delle politiche verso l'esterno: ripetizioni, richieste
+        duplicate e stato dei circuit breaker per host.
+        Returns the state of the upstream policies: retries, hedged requests and
+        circuit breaker state per host.
+
+        Returns:
+            dict:
+                {retries, hedges, breakers: {host: closed | open | half_open}}
+        """
+        with self._resilience_lock:
+            breakers = dict(self._breakers)
+            stats = {"retries": self._retries, "hedges": self._hedges}
+        stats["breakers"] = {host: breaker.state for host, breaker in breakers.items()}
+        return stats
+
+    def _links_key(self, content_id, episode_id):
+        return (str(content_id), None if episode_id is None else str(episode_id))
 
-    def _wbpage_as_text(self, url):
+    def _cached_links(self, content_id, episode_id):
+        if self.links_cache is None:
+            return None
+        return self.links_cache.get(self._links_key(content_id, episode_id))
+
+    def _store_links(self, content_id, episode_id, iframe_url, dl_url):
+        """
+        Salva il link in cache fino a `links_expiry_margin` secondi prima della scadenza del token.
+        Caches the link until `links_expiry_margin` seconds before its token expires.
+        """
+        if self.links_cache is None:
+            return
+        expires = parse_qs(urlparse(dl_url).query).get("expires")
         try:
-            response = requests.get(url, timeout=REQ_TIMEOUT)
-        except requests.exceptions.Timeout as e:
-            raise WebPageTimeOutError(url) from e
-        if response.status_code == 200:
-            return html.unescape(response.text)
-        else:
-            raise WebPageStatusCodeError(url, response.status_code)
+            ttl = int(expires[-1]) - time.time() - self.links_expiry_margin
+        except (TypeError, ValueError):
+            # Senza scadenza nota il link non viene salvato
+            return
+        if ttl > 0:
+            self.links_cache.set(
+                self._links_key(content_id, episode_id), (iframe_url, dl_url), ttl=ttl
+            )
+
+    def _cached_stages(self, content_id, episode_id):
+        """
+        Restituisce (embed_url, iframe_url) salvati per l'episodio, oppure (None, None).
+        Returns the (embed_url, iframe_url) cached for the episode, or (None, None).
+        """
+        if self.stages_cache is None:
+            return None, None
+        return self.stages_cache.get(self._links_key(content_id, episode_id)) or (None, None)
+
+    def _store_stages(self, content_id, episode_id, embed_url, iframe_url):
+        if self.stages_cache is not None:
+            self.stages_cache.set(self._links_key(content_id, episode_id), (embed_url, iframe_url))
+
+    def _drop_stages(self, content_id, episode_id):
+        if self.stages_cache is not None:
+            self.stages_cache.invalidate(self._links_key(content_id, episode_id))
 
     def _html_regex(self, reg, webpage, name):
         match = re.search(reg, webpage)
@@ -137,39 +682,22 @@ class API:
             return match.group(1)
         else:
             raise MatchNotFound(name)
-            
-    def search(self, query):
-        """
-        Cerca nell'API una determinata query e restituisce una lista di risultati.
-        Cerca nell'API una determinata query e restituisce una lista di risultati.
-        Searches the API for a given query and returns a list of results.
 
-        Args:
-            query (str):
-                La query di ricerca.
-                The search query.
+    def _parse_page_data(self, webpage, name="page data"):
+        return json.loads(extract_data_page(webpage, name))
 
-        Returns:
-            list:
-                Una lista di risultati della ricerca.
-                A list of search results.
+    def _title_url(self, content_slug):
+        return self._url.geturl() + "/titles/" + content_slug
 
-        Example:
-        ```
-        search_result = search('something')
-        ```
-        """
-
-        headers = {"user-agent": self.user_agent}
-        query_formatted = query.replace(" ", "%20")
-        url = f"{self._url.geturl()}/api/search?q={query_formatted}"
-
-        try:
-            # Ottenere i risultati della ricerca
-            document = requests.get(url, headers=headers, timeout=REQ_TIMEOUT)
-        except requests.exceptions.Timeout as e:
-            raise WebPageTimeOutError(query) from e
+    def _watch_url(self, content_id, episode_id=None):
+        return (
+            self._url.geturl()
+            + "/watch/"
+            + str(content_id)
+            + ("" if episode_id is None else ("&e=" + str(episode_id)))
+        )
 
+    def _parse_search(self, document, query):
         # Estrarre i risultati della ricerca
         try:
             search_results = document.json()["data"]
@@ -183,79 +711,75 @@ class API:
 
         return output_list
 
+    def _parse_season(self, se_data, season, sid=None, compact=False):
+        loaded_season = se_data["props"]["loadedSeason"]
+        episodes = loaded_season["episodes"]
+        if sid is None:
+            sid = loaded_season.get("title_id") or se_data["props"]["title"]["id"]
+        if compact:
+            base_url = self._url.geturl()
+            return [
+                Episode(
+                    ep["name"],
+                    season,
+                    int(ep["number"]),
+                    ep["plot"],
+                    int(ep["duration"]),
+                    ep["images"],
+                    ep["scws_id"],
+                    ep["id"],
+                    sid,
+                    base_url,
+                )
+                for ep in episodes
+            ]
+        episode_list = []
+        for ep in episodes:
+            scws_id = ep["scws_id"]
+            href = f"{self._url.geturl()}/watch/{sid}?e={ep['id']}"
+
+            episode = {
+                "name": ep["name"],
+                "season": season,
+                "episode": int(ep["number"]),
+                "description": ep["plot"],
+                "duration": int(ep["duration"]),
+                "images": ep["images"],
+                "url": href,
+                "scws_id": scws_id,
+            }
+            episode_list.append(episode)
+        return episode_list
 
-    def preview(self, content_slug):
-        """
-        Carica informazioni minime su un elemento specifico in base al suo URL.
-        Loads minimal information about a specific item by its URL.
-
-        Args:
-            content_slug (str):
-                L'ID dell'elemento da caricare per i dettagli.
-                The ID of the item to load details for.
-
-        Returns:
-            dict:
-                Un dizionario contenente informazioni minimali sull'elemento:
-                A dictionary containing minimal information about the item:
-                    {id, type, runtime, release_date, quality, plot, seasons_count, preview (only for movies), images, genres}.
-
-        Example:
-        ```
-        film_info = preview('6203-movie-name')
-        ```
-        """
-        headers = {"user-agent": self.user_agent}
-        content_id = content_slug.split("-")[0]
-        try:
-            data = requests.post(
-                self._url.geturl() + "/api/titles/preview/" + content_id,
-                headers=headers,
-                timeout=REQ_TIMEOUT,
-            )
-        except Exception as e:
-            raise PreviewError(content_slug, e) from e
-        try:
-            data_dict = data.json()
-        except Exception as e:
-            raise InvalidJSON(content_slug, e, data) from e
-        return data_dict
+    def _parse_identity(self, content_slug, data):
+        title = data["props"]["title"]
+        release_date = title.get("release_date") or ""
+        year = "".join(filter(str.isdigit, release_date.split("-")[0]))
+        return {
+            "id": title.get("id"),
+            "slug": content_slug,
+            "name": title.get("name"),
+            "type": "Movie" if title.get("type") == "movie" else "TvSeries",
+            "year": int(year) if year else None,
+            "tmdb_id": title.get("tmdb_id"),
+            "imdb_id": title.get("imdb_id"),
+        }
 
-    def load(self, content_slug):
+    def _parse_title(self, url, data, preview_data):
         """
-        Carica informazioni dettagliate su un elemento specifico in base al suo URL.
-        Loads detailed information about a specific item by its URL.
+        Costruisce il dizionario di `load` a partire dalla pagina del titolo e dalla preview.
+        Builds the `load` dictionary from the title page and the preview data.
 
-        Args:
-            content_id (str | int):
-                L'URL dell'elemento da caricare per i dettagli.
-                The URL of the item to load details for.
+        Per le serie restituisce anche la lista delle stagioni da scaricare;
+        `episodeList` e `failedSeasons` vanno completati dal chiamante.
+        For series it also returns the list of seasons to fetch;
+        `episodeList` and `failedSeasons` are filled in by the caller.
 
         Returns:
-            dict:
-                Un dizionario contenente informazioni dettagliate sull'elemento, come il tipo, l'anno, la trama, le valutazioni e altro ancora.
-                A dictionary containing detailed information about the item, such as type, year, plot, ratings, and more.
-
-        Example:
-        ```
-        film_info = load('6203-movie-name')
-        ```
+            tuple:
+                (dettagli, stagioni o None)
+                (details, seasons or None)
         """
-        headers = {
-            "user-agent": self.user_agent,
-        }
-        url = self._url.geturl() + "/titles/" + content_slug
-        try:
-            # Ottenere la risposta dell'url dell'elemento
-            resp = self._wbpage_as_text(url)
-            data = json.loads(
-                self._html_regex(r'data-page="([\s\S]+})"', resp, "page data")
-            )
-        except requests.exceptions.Timeout as e:
-            raise WebPageTimeOutError(url) from e
-
-        preview_data = self.preview(content_slug)
-
         # Estrarre i vari dati
         media_type = "Movie" if preview_data["type"] == "movie" else "TvSeries"
 
@@ -297,43 +821,11 @@ class API:
 
             seasons_count = int(props["title"]["seasons_count"])
 
-            episode_list = []
-            for se in seasons:
-                season = int(se["number"])
-                se_url = f"{url}/stagione-{season}"
-                try:
-                    resp = self._wbpage_as_text(se_url)
-                    se_data = json.loads(
-                        self._html_regex(r'data-page="([\s\S]+})"', resp, "page data")
-                    )
-                except requests.exceptions.Timeout as e:
-                    raise WebPageTimeOutError(se_url) from e
-                episodes = se_data["props"]["loadedSeason"]["episodes"]
-                sid = se["title_id"]
-                for ep in episodes:
-                    scws_id = ep["scws_id"]
-                    href = f"{self._url.geturl()}/watch/{sid}?e={ep['id']}"
-
-                    episode = {
-                        "name": ep["name"],
-                        "season": season,
-                        "episode": int(ep["number"]),
-                        "description": ep["plot"],
-                        "duration": int(ep["duration"]),
-                        "images": ep["images"],
-                        "url": href,
-                        "scws_id": scws_id,
-                    }
-                    episode_list.append(episode)
-
-            if not episode_list:
-                raise NoSeasonFoundError(name)
-
             return {
                 "name": name,
                 "url": url,
                 "type": media_type,
-                "episodeList": episode_list,
+                "episodeList": [],
                 "images": images,
                 "year": int("".join(filter(str.isdigit, year))),
                 "plot": plot,
@@ -346,10 +838,11 @@ class API:
                 "sub_ita": bool(sub_ita),
                 "rating": int(float(score) * 1000),
                 "seasons_count": seasons_count,
+                "failedSeasons": [],
                 "tags": [genre["name"] for genre in preview_data["genres"]],
                 "trailerUrl": trailer_url,
                 "recommendations": correlates_list,
-            }
+            }, seasons
 
         return {
             "name": props["title"]["name"],
@@ -371,7 +864,539 @@ class API:
             "duration": int(props["title"]["runtime"]),
             "trailerUrl": trailer_url,
             "recommendations": correlates_list,
-        }
+        }, None
+
+    def _parse_embed_url(self, webpage):
+        # Extract information from data-page attribute
+        data_page = extract_data_page(webpage, "info")
+        try:
+            info = json.loads(data_page)
+        except ValueError:
+            info = json.loads(_TRAILING_COMMA_RE.sub("}", data_page))
+        return info["props"]["embedUrl"]
+
+    def _parse_iframe_url(self, video_page):
+        return html.unescape(
+            self._html_regex(_IFRAME_SRC_RE, video_page, "iframe url")
+        )
+
+    def _parse_playlist(self, iframe_page):
+        # Extract the playlist params and url from the page js
+        playlist_params = json.loads(
+            _TRAILING_COMMA_RE.sub(
+                "}",
+                html.unescape(
+                    self._html_regex(
+                        _PLAYLIST_PARAMS_RE, iframe_page, "playlist params"
+                    )
+                ).replace("'", '"'),
+            )
+        )
+        playlist_url = html.unescape(
+            self._html_regex(_PLAYLIST_URL_RE, iframe_page, "playlist url")
+        )
+        # video_info = json.loads(self._html_regex(r'window\.video[^{]+({[^<]+});',vixcloud_iframe, "video info")
+
+        # Generate the playlist url
+        return (
+            playlist_url
+            + ("&" if bool(_QUERY_RE.search(playlist_url)) else "?")
+            + "&expires="
+            + playlist_params.get("expires")
+            + "&token="
+            + playlist_params.get("token")
+        )
+
+
+class API(_BaseAPI):
+    """
+    Una classe che interagisce con l'API di StreamingCommunity, gestendo le operazioni di ricerca e recupero dei dati.
+    A class to interact with the StreamingCommunity API, handling search and data retrieval operations.
+
+    Attributes:
+        user_agent (str):
+            La stringa User-Agent da usare nelle intestazioni HTTP per le richieste.
+            The User-Agent string to be used in HTTP headers for requests.
+        domain (str):
+            Il nome di dominio dell'API.
+            The domain name of the API.
+        _url (str):
+            L'URL completo costruito dal nome di dominio per effettuare le richieste API.
+            The full URL constructed from the domain name for making API requests.
+
+    Args:
+        domain (str | list):
+            Il nome di dominio dell'API, oppure una lista di mirror in ordine di preferenza: il primo è attivo finché `probe_mirrors` non ne sceglie un altro.
+            The domain name of the API, or a list of mirrors in order of preference: the first one is active until `probe_mirrors` picks another.
+        user_agent (str, optional):
+            La stringa User-Agent da usare nelle intestazioni HTTP. Per impostazione predefinita, è una stringa User-Agent Edge browser in esecuzione su Windows 7.
+            The User-Agent string to be used in HTTP headers. Defaults to a standard User-Agent Edge browser running on Windows 7.
+        pool_connections (int, optional):
+            Numero di host per cui mantenere un pool di connessioni.
+            Number of hosts to keep a connection pool for.
+        pool_maxsize (int, optional):
+            Numero massimo di connessioni keep-alive per host. Dovrebbe essere almeno pari al numero di thread che usano l'istanza.
+            Maximum number of keep-alive connections per host. Should be at least the number of threads sharing the instance.
+        session (requests.Session, optional):
+            Sessione HTTP da usare al posto di quella creata internamente.
+            HTTP session to use instead of the internally created one.
+        season_workers (int, optional):
+            Numero massimo di pagine delle stagioni scaricate in parallelo da `load`.
+            Maximum number of season pages fetched concurrently by `load`.
+        links_cache (TTLCache, optional):
+            Cache dei link restituiti da `get_links`; ogni voce scade prima del token della playlist.
+            Cache for `get_links` results; each entry expires before the playlist token does.
+        links_expiry_margin (float, optional):
+            Secondi di anticipo rispetto a `expires` con cui un link esce dalla cache.
+            Seconds before `expires` at which a cached link is dropped.
+        stages_cache (TTLCache, optional):
+            Cache a lunga durata di `embedUrl` e dell'URL dell'iframe vixcloud, che non cambiano per un episodio:
+            quando il token scade basta riscaricare la pagina dell'iframe. Se un passaggio salvato non funziona più
+            si ripete automaticamente l'intera catena.
+            Long-lived cache of `embedUrl` and of the vixcloud iframe URL, which do not change for an episode:
+            when the token expires only the iframe page is fetched again. If a cached stage stops working the whole
+            chain is replayed automatically.
+        observer (callable, optional):
+            Funzione chiamata come `observer(kind, secondi, errore)` dopo ogni passaggio verso l'esterno
+            (search, preview, title, season, watch, embed, vixcloud); `errore` è None in caso di successo.
+            Function called as `observer(kind, seconds, error)` after every upstream hop
+            (search, preview, title, season, watch, embed, vixcloud); `error` is None on success.
+        retry_policy (RetryPolicy, optional):
+            Politica predefinita di ripetizione e "hedging" delle chiamate esterne. Per impostazione predefinita un solo tentativo.
+            Default retry and hedging policy for upstream calls. Defaults to a single attempt.
+        retry_policies (dict, optional):
+            Politiche per tipo di chiamata (gli stessi `kind` di `observer`), ad esempio {"vixcloud": RetryPolicy(retries=2)}.
+            Policies per call kind (the same `kind` values as `observer`), e.g. {"vixcloud": RetryPolicy(retries=2)}.
+        breaker_threshold (int, optional):
+            Errori consecutivi dopo cui un host viene escluso (`CircuitOpenError`); 0 disattiva il circuit breaker.
+            Consecutive failures after which a host is skipped (`CircuitOpenError`); 0 disables the circuit breaker.
+        breaker_cooldown (float, optional):
+            Secondi di esclusione prima di una nuova chiamata di prova.
+            Seconds a host stays skipped before a new trial call.
+        probe_interval (float, optional):
+            Se maggiore di 0 e ci sono più domini, verifica i mirror in background ogni `probe_interval` secondi.
+            If greater than 0 and there are several domains, probes the mirrors in the background every `probe_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        domain,
+        user_agent=DEFAULT_USER_AGENT,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        session=None,
+        season_workers=SEASON_WORKERS,
+        links_cache=None,
+        links_expiry_margin=LINKS_EXPIRY_MARGIN,
+        observer=None,
+        retry_policy=None,
+        retry_policies=None,
+        breaker_threshold=0,
+        breaker_cooldown=30.0,
+        probe_interval=0,
+        stages_cache=None,
+    ):
+        super().__init__(
+            domain,
+            user_agent,
+            season_workers,
+            links_cache,
+            links_expiry_margin,
+            observer,
+            retry_policy,
+            retry_policies,
+            breaker_threshold,
+            breaker_cooldown,
+            stages_cache,
+        )
+        self._session = session or make_session(pool_connections, pool_maxsize)
+        self._hedge_workers = pool_maxsize
+        self._hedge_executor = None
+        self._probing = threading.Event()
+        if probe_interval > 0 and len(self.domains) > 1:
+            self.start_probing(probe_interval)
+
+    def close(self):
+        """
+        Chiude le connessioni del pool.
+        Closes the pooled connections.
+        """
+        self._probing.set()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self._session.close()
+
+    def _probe(self, domain):
+        url = f"https://{domain}{self.mirror_probe_path}"
+        start = time.perf_counter()
+        try:
+            # Un redirect indica che il dominio si è spostato: non viene seguito
+            response = self._session.get(
+                url,
+                headers={"user-agent": self.user_agent},
+                timeout=REQ_TIMEOUT,
+                allow_redirects=False,
+            )
+        except requests.exceptions.RequestException as e:
+            return self._probe_result(domain, start, error=e)
+        return self._probe_result(domain, start, status=response.status_code)
+
+    def probe_mirrors(self):
+        """
+        Verifica in parallelo tutti i domini e attiva il mirror sano più veloce.
+        Probes every domain concurrently and activates the fastest healthy mirror.
+
+        Returns:
+            str:
+                Il dominio attivo dopo la verifica.
+                The active domain after probing.
+
+        Example:
+        ```
+        sc = API(["streamingcommunity.lu", "streamingcommunity.prof"])
+        domain = sc.probe_mirrors()
+        ```
+        """
+        with ThreadPoolExecutor(max_workers=len(self.domains)) as executor:
+            results = list(executor.map(self._probe, self.domains))
+        return self._apply_probes(results)
+
+    def start_probing(self, interval):
+        """
+        Avvia un thread in background che chiama `probe_mirrors` ogni `interval` secondi, fino a `close`.
+        Starts a background thread calling `probe_mirrors` every `interval` seconds, until `close`.
+        """
+
+        def run():
+            while not self._probing.is_set():
+                try:
+                    self.probe_mirrors()
+                except Exception:
+                    pass
+                self._probing.wait(interval)
+
+        threading.Thread(target=run, name="scuapi-mirror-probe", daemon=True).start()
+
+    def _hedged(self, send, url, delay, **kwargs):
+        """
+        Invia la richiesta e, se dopo `delay` secondi non ha risposto, ne invia una seconda
+        identica; restituisce la prima risposta arrivata.
+        Sends the request and, if it has not answered after `delay` seconds, sends an
+        identical second one; returns the first response to arrive.
+        """
+        with self._resilience_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self._hedge_workers, thread_name_prefix="scuapi-hedge"
+                )
+        first = self._hedge_executor.submit(send, url, **kwargs)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        self._count("_hedges")
+        pending = {first, self._hedge_executor.submit(send, url, **kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # La richiesta più lenta prosegue in background e viene ignorata
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _request(self, method, url, kind, **kwargs):
+        """
+        Esegue una richiesta applicando la politica di `kind` e il circuit breaker dell'host.
+        Performs a request applying the policy for `kind` and the host circuit breaker.
+
+        Le GET vengono ripetute su timeout, errori di connessione e `RETRY_STATUSES`;
+        dopo l'ultimo tentativo viene sollevata l'eccezione o restituita la risposta.
+        GETs are retried on timeouts, connection errors and `RETRY_STATUSES`; after the
+        last attempt the exception is raised or the response returned.
+        """
+        send = self._session.get if method == "GET" else self._session.post
+        policy = self._policy(kind)
+        breaker = self._breaker(url)
+        attempts = 1 + policy.retries if method == "GET" else 1
+
+        for attempt in range(attempts):
+            if attempt:
+                self._count("_retries")
+                time.sleep(policy.delay(attempt))
+            self._check_breaker(breaker, url)
+
+            delay = self._hedge_delay(kind, policy) if method == "GET" else None
+            start = time.perf_counter()
+            try:
+                if delay is None:
+                    response = send(url, **kwargs)
+                else:
+                    response = self._hedged(send, url, delay, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+                self._record_outcome(breaker, False)
+                if attempt + 1 == attempts:
+                    raise
+                continue
+            except Exception:
+                self._record_outcome(breaker, False)
+                raise
+            except BaseException:
+                # Chiamata annullata (es. CancelledError): libera la prova senza contarla come errore
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            failed = response.status_code in RETRY_STATUSES
+            self._record_outcome(breaker, not failed)
+            if not failed:
+                self._latency(kind).add(time.perf_counter() - start)
+            if not failed or attempt + 1 == attempts:
+                return response
+
+    def _wbpage_as_text(self, url, kind="title"):
+        try:
+            response = self._request("GET", url, kind, timeout=REQ_TIMEOUT)
+        except requests.exceptions.Timeout as e:
+            raise WebPageTimeOutError(url) from e
+        if response.status_code == 200:
+            return response.text
+        else:
+            raise WebPageStatusCodeError(url, response.status_code)
+
+    def _page_data(self, url, name="page data", kind="title"):
+        with self._observe(kind):
+            return self._parse_page_data(self._wbpage_as_text(url, kind), name)
+
+    def _season_episodes(self, url, season, sid=None, compact=False):
+        se_data = self._page_data(f"{url}/stagione-{season}", kind="season")
+        return self._parse_season(se_data, season, sid, compact)
+
+    def _load_seasons(self, url, seasons, compact=False):
+        """
+        Scarica le pagine delle stagioni in parallelo mantenendo l'ordine originale.
+        Fetches the season pages concurrently, keeping the original order.
+
+        Le stagioni che falliscono non interrompono il caricamento:
+        vengono restituite separatamente.
+        Failing seasons do not abort the load: they are returned separately.
+
+        Returns:
+            tuple:
+                (lista degli episodi, numeri delle stagioni fallite)
+                (episode list, numbers of the failed seasons)
+        """
+
+        def fetch(se):
+            try:
+                return self._season_episodes(
+                    url, int(se["number"]), se["title_id"], compact
+                )
+            except (SCAPIError, requests.exceptions.RequestException, ValueError, KeyError, TypeError):
+                return None
+
+        workers = min(self.season_workers, len(seasons)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, seasons))
+
+        episode_list = []
+        failed_seasons = []
+        for se, episodes in zip(seasons, results):
+            if episodes is None:
+                failed_seasons.append(int(se["number"]))
+            else:
+                episode_list.extend(episodes)
+        return episode_list, failed_seasons
+
+    def search(self, query):
+        """
+        Cerca nell'API una determinata query e restituisce una lista di risultati.
+        Cerca nell'API una determinata query e restituisce una lista di risultati.
+        Searches the API for a given query and returns a list of results.
+
+        Args:
+            query (str):
+                La query di ricerca.
+                The search query.
+
+        Returns:
+            list:
+                Una lista di risultati della ricerca.
+                A list of search results.
+
+        Example:
+        ```
+        search_result = search('something')
+        ```
+        """
+
+        headers = {"user-agent": self.user_agent}
+        query_formatted = query.replace(" ", "%20")
+        url = f"{self._url.geturl()}/api/search?q={query_formatted}"
+
+        with self._observe("search"):
+            try:
+                # Ottenere i risultati della ricerca
+                document = self._request("GET", url, "search", headers=headers, timeout=REQ_TIMEOUT)
+            except requests.exceptions.Timeout as e:
+                raise WebPageTimeOutError(query) from e
+
+            return self._parse_search(document, query)
+
+
+    def preview(self, content_slug):
+        """
+        Carica informazioni minime su un elemento specifico in base al suo URL.
+        Loads minimal information about a specific item by its URL.
+
+        Args:
+            content_slug (str):
+                L'ID dell'elemento da caricare per i dettagli.
+                The ID of the item to load details for.
+
+        Returns:
+            dict:
+                Un dizionario contenente informazioni minimali sull'elemento:
+                A dictionary containing minimal information about the item:
+                    {id, type, runtime, release_date, quality, plot, seasons_count, preview (only for movies), images, genres}.
+
+        Example:
+        ```
+        film_info = preview('6203-movie-name')
+        ```
+        """
+        headers = {"user-agent": self.user_agent}
+        content_id = content_slug.split("-")[0]
+        with self._observe("preview"):
+            try:
+                data = self._request(
+                    "POST",
+                    self._url.geturl() + "/api/titles/preview/" + content_id,
+                    "preview",
+                    headers=headers,
+                    timeout=REQ_TIMEOUT,
+                )
+            except Exception as e:
+                raise PreviewError(content_slug, e) from e
+            try:
+                data_dict = data.json()
+            except Exception as e:
+                raise InvalidJSON(content_slug, e, data) from e
+            return data_dict
+
+    def identity(self, content_slug):
+        """
+        Legge solo i dati identificativi di un titolo dalla sua pagina, senza preview né stagioni.
+        Reads only the identity fields of a title from its page, without preview or seasons.
+
+        Args:
+            content_slug (str):
+                Lo slug del titolo.
+                The title slug.
+
+        Returns:
+            dict:
+                {id, slug, name, type, year, tmdb_id, imdb_id}
+
+        Example:
+        ```
+        ids = identity('6203-movie-name')
+        ```
+        """
+        return self._parse_identity(
+            content_slug, self._page_data(self._title_url(content_slug))
+        )
+
+    def load_season(self, content_slug, season, compact=False):
+        """
+        Carica gli episodi di una sola stagione, senza scaricare le altre.
+        Loads the episodes of a single season, without fetching the others.
+
+        Args:
+            content_slug (str):
+                Lo slug della serie.
+                The series slug.
+            season (str | int):
+                Il numero della stagione.
+                The season number.
+            compact (bool, optional):
+                Se True, restituisce una `Series` (con `info` vuoto) che contiene solo questa stagione, indicizzata per (stagione, episodio).
+                If True, returns a `Series` (with an empty `info`) holding only this season, indexed by (season, episode).
+
+        Returns:
+            list | Series:
+                Gli episodi della stagione, nello stesso formato di `episodeList` di `load`.
+                The season episodes, in the same format as `load`'s `episodeList`.
+
+        Example:
+        ```
+        episodes = load_season('6203-series-name', 2)
+        ```
+        """
+        url = self._title_url(content_slug)
+        episode_list = self._season_episodes(url, int(season), compact=compact)
+        if not episode_list:
+            raise NoSeasonFoundError(content_slug)
+        return Series({}, episode_list) if compact else episode_list
+
+    def load(self, content_slug, lazy=False, compact=False):
+        """
+        Carica informazioni dettagliate su un elemento specifico in base al suo URL.
+        Loads detailed information about a specific item by its URL.
+
+        Args:
+            content_id (str | int):
+                L'URL dell'elemento da caricare per i dettagli.
+                The URL of the item to load details for.
+            lazy (bool, optional):
+                Se True, `episodeList` è una `LazyEpisodeList` che scarica le stagioni solo quando vengono lette.
+                If True, `episodeList` is a `LazyEpisodeList` that fetches seasons only when they are read.
+            compact (bool, optional):
+                Se True, per le serie restituisce un oggetto `Series` con episodi compatti indicizzati per (stagione, episodio); `to_dict()` fornisce il formato abituale.
+                If True, series are returned as a `Series` object with compact episodes indexed by (season, episode); `to_dict()` gives the usual format.
+
+        Returns:
+            dict:
+                Un dizionario contenente informazioni dettagliate sull'elemento, come il tipo, l'anno, la trama, le valutazioni e altro ancora.
+                A dictionary containing detailed information about the item, such as type, year, plot, ratings, and more.
+                Per le serie, `failedSeasons` elenca le stagioni che non è stato possibile scaricare.
+                For series, `failedSeasons` lists the seasons that could not be fetched.
+
+        Example:
+        ```
+        film_info = load('6203-movie-name')
+        ```
+        """
+        url = self._title_url(content_slug)
+        # Ottenere la risposta dell'url dell'elemento
+        data = self._page_data(url)
+
+        preview_data = self.preview(content_slug)
+
+        details, seasons = self._parse_title(url, data, preview_data)
+
+        # Estrarre i dati degli episodi per le serie
+        if seasons is not None:
+            if lazy:
+                if not seasons:
+                    raise NoSeasonFoundError(details["name"])
+                details["episodeList"] = LazyEpisodeList(self, url, seasons)
+                details["failedSeasons"] = details["episodeList"].failed_seasons
+            else:
+                # Le pagine delle stagioni vengono scaricate in parallelo
+                episode_list, failed_seasons = self._load_seasons(url, seasons, compact)
+
+                if not episode_list:
+                    raise NoSeasonFoundError(details["name"])
+
+                details["failedSeasons"] = failed_seasons
+                if compact:
+                    del details["episodeList"]
+                    return Series(details, episode_list)
+                details["episodeList"] = episode_list
+
+        return details
 
     def get_links(self, content_id, episode_id=None):
         """
@@ -398,60 +1423,37 @@ class API:
         ```
         """
 
-        webpage = self._wbpage_as_text(
-            self._url.geturl()
-            + "/watch/"
-            + str(content_id)
-            + ("" if episode_id is None else ("&e=" + str(episode_id)))
-        )
-
-        # Extract information from data-page attribute
-        info = json.loads(
-            re.sub(
-                r',[^"]+}',
-                "}",
-                self._html_regex(r'data-page="([\s\S]+})"', webpage, "info"),
-            )
-        )
-
-        # Extract the video page url
-        video_page_url = self._wbpage_as_text(info["props"]["embedUrl"])
-
-        # Get the iframe url and iframe page
-        iframe_url = self._html_regex(
-            r'<iframe[^>]+src\s*=\s*"([^"]+)', video_page_url, "iframe url"
-        )
-        iframe_page = self._wbpage_as_text(iframe_url)
-
-        # Extract the playlist params and url from the page js
-        playlist_params = json.loads(
-            re.sub(
-                r',[^"]+}',
-                "}",
-                self._html_regex(
-                    r"window\.masterPlaylist[^:]+params:[^{]+({[^<]+?})",
-                    iframe_page,
-                    "playlist params",
-                ).replace("'", '"'),
-            )
-        )
-        playlist_url = self._html_regex(
-            r"window\.masterPlaylist[^<]+url:[^<]+\'([^<]+?)\'",
-            iframe_page,
-            "playlist url",
-        )
-        # video_info = json.loads(self._html_regex(r'window\.video[^{]+({[^<]+});',vixcloud_iframe, "video info")
-
-        # Generate the playlist url
-        dl_url = (
-            playlist_url
-            + ("&" if bool(re.search(r"\?[^#]+", playlist_url)) else "?")
-            + "&expires="
-            + playlist_params.get("expires")
-            + "&token="
-            + playlist_params.get("token")
-        )
-
+        cached = self._cached_links(content_id, episode_id)
+        if cached is not None:
+            return cached
+
+        embed_url, iframe_url = self._cached_stages(content_id, episode_id)
+        if iframe_url is not None:
+            try:
+                # Solo il token è scaduto: basta riscaricare la pagina dell'iframe
+                return self._links_chain(content_id, episode_id, embed_url, iframe_url)
+            except (SCAPIError, ValueError, KeyError):
+                self._drop_stages(content_id, episode_id)
+        return self._links_chain(content_id, episode_id)
+
+    def _links_chain(self, content_id, episode_id, embed_url=None, iframe_url=None):
+        if iframe_url is None:
+            with self._observe("watch"):
+                webpage = self._wbpage_as_text(self._watch_url(content_id, episode_id), "watch")
+                embed_url = self._parse_embed_url(webpage)
+
+            # Extract the video page url
+            with self._observe("embed"):
+                video_page_url = self._wbpage_as_text(embed_url, "embed")
+
+                # Get the iframe url and iframe page
+                iframe_url = self._parse_iframe_url(video_page_url)
+
+        with self._observe("vixcloud"):
+            iframe_page = self._wbpage_as_text(iframe_url, "vixcloud")
+            dl_url = self._parse_playlist(iframe_page)
+        self._store_stages(content_id, episode_id, embed_url, iframe_url)
+        self._store_links(content_id, episode_id, iframe_url, dl_url)
         return iframe_url, dl_url
 
 
@@ -0,0 +1,96 @@
+"""
+    Coalescenza delle chiamate identiche in corso (single-flight)
+    Coalescing of identical in-flight calls (single-flight)
+"""
+
+import threading
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Esegue una sola volta le chiamate concorrenti con la stessa chiave: i chiamanti
+    che arrivano mentre la prima è in corso ne attendono e condividono il risultato
+    (o l'eccezione).
+    Runs concurrent calls sharing the same key only once: callers arriving while
+    the first one is in flight wait for it and share its result (or exception).
+
+    Attributes:
+        calls (int):
+            Numero di chiamate effettivamente eseguite.
+            Number of calls actually executed.
+        shared (int):
+            Numero di chiamanti serviti da una chiamata già in corso.
+            Number of callers served by an already in-flight call.
+
+    Example:
+    ```
+    flight = SingleFlight()
+    results = flight.do(("search", query), sc.search, query)
+    ```
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Esegue `fn(*args, **kwargs)`, oppure attende la chiamata già in corso per `key`.
+        Runs `fn(*args, **kwargs)`, or waits for the call already in flight for `key`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def stats(self):
+        """
+        Restituisce i contatori delle chiamate.
+        Returns the call counters.
+
+        Include anche le chiavi di `TTLCache.stats`: un chiamante servito da una chiamata in corso è un hit.
+        Also includes the `TTLCache.stats` keys: a caller served by an in-flight call is a hit.
+        """
+        with self._lock:
+            lookups = self.calls + self.shared
+            return {
+                "calls": self.calls,
+                "shared": self.shared,
+                "in_flight": len(self._calls),
+                "size": len(self._calls),
+                "hits": self.shared,
+                "misses": self.calls,
+                "hit_ratio": self.shared / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,450 @@
+"""
+    Archivi persistenti su SQLite
+    Persistent SQLite-backed stores
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+# Valore restituito da ResolutionIndex.get per un "nessuna corrispondenza" memorizzato
+NO_MATCH = object()
+
+
+class _SQLiteStore:
+    """
+    Connessione SQLite condivisa tra thread e protetta da un lock.
+    SQLite connection shared between threads and guarded by a lock.
+    """
+
+    _table = ""
+    _schema = ""
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._schema)
+        self._conn.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.fetchall()
+
+    def _count(self, hits, misses):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def __len__(self):
+        return self._execute(f"SELECT COUNT(*) FROM {self._table}")[0][0]
+
+    def stats(self):
+        """
+        Restituisce dimensione e contatori, nello stesso formato di `TTLCache.stats`.
+        Returns size and counters, in the same format as `TTLCache.stats`.
+        """
+        size = len(self)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResolutionIndex(_SQLiteStore):
+    """
+    Indice persistente IMDb ID -> titolo StreamingCommunity (id e slug).
+    Persistent IMDb ID -> StreamingCommunity title (id and slug) index.
+
+    Memorizza anche i "nessuna corrispondenza", con una durata più breve, così gli
+    ID sconosciuti non ripetono ogni volta l'intera risoluzione.
+    It also stores "no match" results, with a shorter lifetime, so unknown ids do
+    not replay the whole resolution every time.
+
+    Args:
+        path (str):
+            Percorso del file SQLite.
+            Path of the SQLite file.
+        ttl (float, optional):
+            Durata di una corrispondenza, in secondi.
+            Lifetime of a match, in seconds.
+        negative_ttl (float, optional):
+            Durata di un "nessuna corrispondenza", in secondi.
+            Lifetime of a "no match", in seconds.
+
+    Example:
+    ```
+    index = ResolutionIndex("resolution.sqlite3")
+    index.put("tt0903747", 8813, "breaking-bad", "Breaking Bad")
+    entry = index.get("tt0903747")
+    ```
+    """
+
+    _table = "resolution"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS resolution (
+            imdb_id TEXT PRIMARY KEY,
+            sc_id INTEGER,
+            slug TEXT,
+            name TEXT,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path, ttl=30 * 24 * 3600, negative_ttl=6 * 3600):
+        super().__init__(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # Hit che hanno restituito un "nessuna corrispondenza" (inclusi in `hits`)
+        self.negative_hits = 0
+
+    def get(self, imdb_id):
+        """
+        Restituisce la corrispondenza salvata, `NO_MATCH` o None se sconosciuta o scaduta.
+        Returns the stored match, `NO_MATCH`, or None if unknown or expired.
+
+        Returns:
+            dict | object | None:
+                {id, slug, name} oppure `NO_MATCH` oppure None.
+                {id, slug, name} or `NO_MATCH` or None.
+        """
+        rows = self._execute(
+            "SELECT sc_id, slug, name FROM resolution WHERE imdb_id = ? AND expires_at > ?",
+            (imdb_id, time.time()),
+        )
+        if not rows:
+            self._count(0, 1)
+            return None
+        self._count(1, 0)
+        sc_id, slug, name = rows[0]
+        if sc_id is None:
+            with self._lock:
+                self.negative_hits += 1
+            return NO_MATCH
+        return {"id": sc_id, "slug": slug, "name": name}
+
+    def put(self, imdb_id, sc_id, slug, name=None):
+        """
+        Salva una corrispondenza.
+        Stores a match.
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO resolution VALUES (?, ?, ?, ?, ?)",
+            (imdb_id, sc_id, slug, name, time.time() + self.ttl),
+        )
+
+    def put_miss(self, imdb_id):
+        """
+        Salva un "nessuna corrispondenza" con la durata breve.
+        Stores a "no match" with the short lifetime.
+        """
+        self._execute(
+            "INSERT OR REPLACE INTO resolution VALUES (?, NULL, NULL, NULL, ?)",
+            (imdb_id, time.time() + self.negative_ttl),
+        )
+
+    def invalidate(self, imdb_id=None):
+        """
+        Rimuove una voce, oppure tutte se `imdb_id` è None.
+        Removes an entry, or every entry if `imdb_id` is None.
+        """
+        if imdb_id is None:
+            self._execute("DELETE FROM resolution")
+        else:
+            self._execute("DELETE FROM resolution WHERE imdb_id = ?", (imdb_id,))
+
+    def purge_expired(self):
+        """
+        Elimina le voci scadute.
+        Deletes expired entries.
+        """
+        self._execute("DELETE FROM resolution WHERE expires_at <= ?", (time.time(),))
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats["negative_hits"] = self.negative_hits
+        return stats
+
+
+class TranslationCache(_SQLiteStore):
+    """
+    Cache persistente delle traduzioni, indicizzata per testo sorgente e lingua di destinazione.
+    Persistent translation cache, keyed by source text and target language.
+
+    Args:
+        path (str):
+            Percorso del file SQLite.
+            Path of the SQLite file.
+        target (str, optional):
+            Lingua di destinazione.
+            Target language.
+    """
+
+    _table = "translation"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS translation (
+            source TEXT NOT NULL,
+            target TEXT NOT NULL,
+            translated TEXT NOT NULL,
+            PRIMARY KEY (source, target)
+        );
+    """
+
+    def __init__(self, path, target="it"):
+        super().__init__(path)
+        self.target = target
+
+    def get_many(self, sources):
+        """
+        Restituisce un dizionario {sorgente: traduzione} per i testi già tradotti.
+        Returns a {source: translation} dict for the texts already translated.
+        """
+        sources = list(dict.fromkeys(sources))
+        if not sources:
+            return {}
+        placeholders = ", ".join("?" for _ in sources)
+        rows = self._execute(
+            f"SELECT source, translated FROM translation WHERE target = ? AND source IN ({placeholders})",
+            (self.target, *sources),
+        )
+        self._count(len(rows), len(sources) - len(rows))
+        return dict(rows)
+
+    def put_many(self, translations):
+        """
+        Salva un dizionario {sorgente: traduzione}.
+        Stores a {source: translation} dict.
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation VALUES (?, ?, ?)",
+                [(source, self.target, translated) for source, translated in translations.items()],
+            )
+            self._conn.commit()
+
+
+class CatalogIndex(_SQLiteStore):
+    """
+    Catalogo locale dei titoli StreamingCommunity, alimentato dai risultati di `API.search`
+    e completato con gli ID TMDb/IMDb man mano che diventano noti.
+    Local catalog of StreamingCommunity titles, fed by `API.search` results and
+    completed with TMDb/IMDb ids as they become known.
+
+    Le righe hanno lo stesso formato dei risultati di `API.search` (id, slug, name,
+    type, first_air_date, last_air_date), più `tmdb_id` e `imdb_id`.
+    Rows have the same shape as `API.search` results (id, slug, name, type,
+    first_air_date, last_air_date), plus `tmdb_id` and `imdb_id`.
+
+    Args:
+        path (str):
+            Percorso del file SQLite.
+            Path of the SQLite file.
+
+    Example:
+    ```
+    catalog = CatalogIndex("catalog.sqlite3")
+    catalog.upsert_many(sc.search("breaking bad"))
+    catalog.set_ids(8813, tmdb_id=1396, imdb_id="tt0903747")
+    title = catalog.by_imdb_id("tt0903747")
+    ```
+    """
+
+    _table = "catalog"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS catalog (
+            sc_id INTEGER PRIMARY KEY,
+            slug TEXT,
+            name TEXT,
+            type TEXT,
+            first_air_date TEXT,
+            last_air_date TEXT,
+            tmdb_id INTEGER,
+            imdb_id TEXT,
+            updated_at REAL NOT NULL,
+            checked_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS catalog_imdb_id ON catalog (imdb_id);
+    """
+
+    _columns = "sc_id, slug, name, type, first_air_date, last_air_date, tmdb_id, imdb_id"
+
+    def __init__(self, path):
+        super().__init__(path)
+        # Incrementato solo quando un nome cambia o compare un titolo nuovo, per aggiornare le copie in memoria
+        self.version = 0
+        self._name_changes = {}
+
+    @staticmethod
+    def _row(row):
+        sc_id, slug, name, title_type, first_air_date, last_air_date, tmdb_id, imdb_id = row
+        return {
+            "id": sc_id,
+            "slug": slug,
+            "name": name,
+            "type": title_type,
+            "first_air_date": first_air_date,
+            "last_air_date": last_air_date,
+            "tmdb_id": tmdb_id,
+            "imdb_id": imdb_id,
+        }
+
+    def upsert_many(self, results):
+        """
+        Aggiunge o aggiorna i titoli a partire dai risultati di `API.search`,
+        mantenendo gli ID TMDb/IMDb già noti.
+        Adds or updates titles from `API.search` results, keeping the TMDb/IMDb
+        ids already known.
+        """
+        now = time.time()
+        rows = [
+            (
+                result["id"],
+                result.get("slug"),
+                result.get("name"),
+                result.get("type"),
+                result.get("first_air_date"),
+                result.get("last_air_date"),
+                now,
+            )
+            for result in results
+            if result.get("id") is not None
+        ]
+        if not rows:
+            return
+        with self._lock:
+            ids = [row[0] for row in rows]
+            placeholders = ", ".join("?" for _ in ids)
+            known = dict(
+                self._conn.execute(
+                    f"SELECT sc_id, name FROM catalog WHERE sc_id IN ({placeholders})", ids
+                ).fetchall()
+            )
+            changed = [
+                (sc_id, name)
+                for sc_id, _, name, *_ in rows
+                if name is not None and known.get(sc_id) != name
+            ]
+            self._conn.executemany(
+                """
+                INSERT INTO catalog (sc_id, slug, name, type, first_air_date, last_air_date, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (sc_id) DO UPDATE SET
+                    slug = excluded.slug,
+                    name = excluded.name,
+                    type = excluded.type,
+                    first_air_date = COALESCE(excluded.first_air_date, first_air_date),
+                    last_air_date = COALESCE(excluded.last_air_date, last_air_date),
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+            self._conn.commit()
+            if changed:
+                self.version += 1
+                for sc_id, name in changed:
+                    self._name_changes[sc_id] = (self.version, name)
+
+    def set_ids(self, sc_id, tmdb_id=None, imdb_id=None):
+        """
+        Registra gli ID TMDb/IMDb di un titolo già presente e lo segna come verificato.
+        Records the TMDb/IMDb ids of a title already present and marks it as checked.
+        """
+        self._execute(
+            """
+            UPDATE catalog SET
+                tmdb_id = COALESCE(?, tmdb_id),
+                imdb_id = COALESCE(?, imdb_id),
+                checked_at = ?
+            WHERE sc_id = ?
+            """,
+            (tmdb_id, imdb_id.lower() if imdb_id else None, time.time(), sc_id),
+        )
+
+    def by_imdb_id(self, imdb_id):
+        """
+        Restituisce il titolo con questo IMDb ID, oppure None.
+        Returns the title with this IMDb id, or None.
+        """
+        rows = self._execute(
+            f"SELECT {self._columns} FROM catalog WHERE imdb_id = ?", (imdb_id.lower(),)
+        )
+        return self._row(rows[0]) if rows else None
+
+    def get_many(self, sc_ids):
+        """
+        Restituisce i titoli con questi ID, nello stesso ordine.
+        Returns the titles with these ids, in the same order.
+        """
+        sc_ids = list(sc_ids)
+        if not sc_ids:
+            return []
+        placeholders = ", ".join("?" for _ in sc_ids)
+        rows = self._execute(
+            f"SELECT {self._columns} FROM catalog WHERE sc_id IN ({placeholders})", sc_ids
+        )
+        by_id = {row[0]: self._row(row) for row in rows}
+        return [by_id[sc_id] for sc_id in sc_ids if sc_id in by_id]
+
+    def names(self):
+        """
+        Restituisce le coppie (id, nome) di tutti i titoli, per la ricerca approssimata.
+        Returns the (id, name) pairs of every title, for fuzzy lookups.
+        """
+        return self._execute("SELECT sc_id, name FROM catalog WHERE name IS NOT NULL")
+
+    def name_changes(self, since=None):
+        """
+        Restituisce i nomi aggiunti o cambiati dopo la versione `since`, oppure tutti se `since` è None.
+        Returns the names added or changed after version `since`, or every name if `since` is None.
+
+        Returns:
+            tuple:
+                (versione attuale, [(id, nome)])
+                (current version, [(id, name)])
+        """
+        with self._lock:
+            if since is None:
+                rows = self._conn.execute(
+                    "SELECT sc_id, name FROM catalog WHERE name IS NOT NULL"
+                ).fetchall()
+                return self.version, rows
+            return self.version, [
+                (sc_id, name)
+                for sc_id, (version, name) in self._name_changes.items()
+                if version > since
+            ]
+
+    def unchecked(self, limit, older_than=0):
+        """
+        Restituisce fino a `limit` titoli senza IMDb ID non verificati dopo `older_than`.
+        Returns up to `limit` titles without an IMDb id not checked since `older_than`.
+        """
+        rows = self._execute(
+            f"""
+            SELECT {self._columns} FROM catalog
+            WHERE imdb_id IS NULL AND (checked_at IS NULL OR checked_at < ?)
+            ORDER BY checked_at IS NOT NULL, checked_at
+            LIMIT ?
+            """,
+            (older_than, limit),
+        )
+        return [self._row(row) for row in rows]
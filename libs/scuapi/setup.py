@@ -10,4 +10,8 @@ setup(
     install_requires=[
         # Elenca qui le dipendenze della tua libreria, se ce ne sono
     ],
+    extras_require={
+        # Necessario solo per AsyncAPI
+        "async": ["httpx"],
+    },
 )